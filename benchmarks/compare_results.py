@@ -0,0 +1,29 @@
+"""Compare two benchmark result files.
+
+    python benchmarks/compare_results.py before.json after.json
+"""
+import json
+import sys
+
+def main():
+    if len(sys.argv) != 3:
+        print(__doc__.strip())
+        sys.exit(2)
+    with open(sys.argv[1]) as before_file, open(sys.argv[2]) as after_file:
+        before, after = json.load(before_file), json.load(after_file)
+
+    print(f"{'size':>6} {'benchmark':<16} {'before ms':>10} {'after ms':>10} {'change':>8}")
+    for size, benches in after['sizes'].items():
+        for name, stats in benches.items():
+            old = before.get('sizes', {}).get(size, {}).get(name)
+            if not isinstance(stats, dict) or not isinstance(old, dict):
+                continue
+            change = (stats['median_ms'] - old['median_ms']) / old['median_ms'] * 100 if old['median_ms'] else 0
+            print(f"{size:>6} {name:<16} {old['median_ms']:10.2f} {stats['median_ms']:10.2f} {change:+7.1f}%")
+
+    old_status, new_status = before.get('api_status'), after.get('api_status')
+    if old_status and new_status:
+        print(f"/api/status req/s: {old_status['requests_per_sec']:.0f} -> {new_status['requests_per_sec']:.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Synthetic and recorded FlightRadar24 schedule payloads for benchmarks."""
+import gzip
+import json
+import os
+import random
+
+from services.carrier_logo_service import CARRIER_LOGOS
+from services.fr24_replay import CAPTURE_SUFFIX
+
+AIRCRAFT_CODES = ['C68A', 'CL35', 'PC12', 'E55P', 'GLF4', 'BE20', 'C56X', 'LJ45', 'H25B', 'FA7X', 'ZZZZ', 'XXXX']
+UNKNOWN_CARRIERS = ['Skyward Charter', 'Private owner', 'Atlantic Air']
+STATUSES = ['Scheduled', 'Estimated 10:32', 'Landed 9:58', 'Delayed', 'Diverted to TTN', 'Canceled']
+AIRPORTS = [('TEB', 'Teterboro'), ('PBI', 'Palm Beach'), ('HPN', 'White Plains'), ('BOS', 'Boston Logan'), ('MMU', 'Morristown')]
+
+def synthetic_flight(rng, index, mode, now):
+    scheduled = now + rng.randint(-3600, 6 * 3600)
+    estimated = scheduled + rng.choice([0, 0, 120, 600, -480])
+    carrier = rng.choice(list(CARRIER_LOGOS) + UNKNOWN_CARRIERS + [None])
+    prefix = rng.choice(['EJA', 'LXJ', 'LFG', 'JNY', 'JTL', 'N'])
+    code, name = rng.choice(AIRPORTS)
+    return {'flight': {
+        'identification': {
+            'id': f'{index:08x}',
+            'number': {'default': f'{prefix}{index}'},
+            'callsign': f'{prefix}{index}' if rng.random() < 0.8 else None,
+        },
+        'status': {'text': rng.choice(STATUSES), 'live': False},
+        'aircraft': {'model': {'code': rng.choice(AIRCRAFT_CODES), 'text': ''},
+                     'registration': f'N{rng.randint(100, 999)}QS' if rng.random() < 0.9 else None},
+        'owner': None,
+        'airline': {'name': carrier, 'code': {'iata': None, 'icao': prefix}} if carrier else None,
+        'airport': {'origin': {'code': {'iata': code, 'icao': 'K' + code}, 'name': name},
+                    'destination': {'code': {'iata': code, 'icao': 'K' + code}, 'name': name}},
+        'time': {'scheduled': {'departure': scheduled, 'arrival': scheduled},
+                 'estimated': {'departure': estimated, 'arrival': estimated},
+                 'real': {'departure': None, 'arrival': None}},
+    }}
+
+def synthetic_payload(mode, count, now, seed=0):
+    """Build an airport.json response with ``count`` flights for one schedule mode."""
+    rng = random.Random(f'{seed}-{mode}-{count}')
+    # FlightRadar24 echoes the request, with its own schedule settings, ahead of the response
+    request = {
+        'callback': None, 'code': 'KBLM', 'format': 'json', 'limit': count, 'page': 1,
+        'plugin': ['schedule'], 'plugin-setting': {'schedule': {'mode': mode, 'timestamp': now}},
+        'token': None,
+    }
+    return {'result': {'request': request, 'response': {'airport': {'pluginData': {
+        'details': {'name': 'Benchmark Airport', 'code': {'iata': 'BLM', 'icao': 'KBLM'}},
+        'schedule': {mode: {
+            'item': {'current': count, 'total': count, 'limit': count},
+            'page': {'current': 1, 'total': 1},
+            'data': [synthetic_flight(rng, index, mode, now) for index in range(count)],
+        }},
+    }}}}}
+
+def recorded_payloads(capture_dir):
+    """Yield (mode, payload) for every capture written by fr24_capture_dir."""
+    for filename in sorted(os.listdir(capture_dir)):
+        if filename.endswith(CAPTURE_SUFFIX):
+            mode = filename.split('_')[1]
+            with gzip.open(os.path.join(capture_dir, filename), 'rb') as capture_file:
+                yield mode, json.loads(capture_file.read())
+
+def scale_payload(mode, payload, count):
+    """Repeat a recorded payload's flights until it holds ``count`` of them."""
+    schedule = payload['result']['response']['airport']['pluginData']['schedule'][mode]
+    flights = schedule['data'] or [{}]
+    data = [flights[index % len(flights)] for index in range(count)]
+    scaled = json.loads(json.dumps(payload))
+    scaled['result']['response']['airport']['pluginData']['schedule'][mode].update(
+        data=data, item={'current': count, 'total': count, 'limit': count})
+    return scaled
@@ -0,0 +1,245 @@
+"""Benchmark the board's parse, lookup, render and serve hot paths.
+
+    python benchmarks/run_benchmarks.py                      # synthetic payloads
+    python benchmarks/run_benchmarks.py --captures captures  # scale up recorded responses
+    python benchmarks/run_benchmarks.py --sizes 100 1000 --output results.json
+
+Results are written as JSON (default: benchmarks/results/latest.json) so runs
+can be compared with compare_results.py.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), 'src'))
+sys.path.insert(0, BENCH_DIR)
+
+import requests # type: ignore
+from requests.adapters import BaseAdapter # type: ignore
+from werkzeug.serving import WSGIRequestHandler, make_server # type: ignore
+
+import app as board_app
+from services import flight_data_fetcher
+from services.flight_records import DIRECTIONS
+from services.rate_limiter import RateLimiter
+from payloads import recorded_payloads, scale_payload, synthetic_payload
+
+DEFAULT_SIZES = (100, 1000, 10000)
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, 'results', 'latest.json')
+
+class CannedAdapter(BaseAdapter):
+    """requests transport that returns pre-encoded bodies per schedule mode, with no I/O."""
+
+    def __init__(self, bodies):
+        super().__init__()
+        self.bodies = bodies
+
+    def send(self, request, **kwargs):
+        mode = 'departures' if 'mode%5D=departures' in request.url or 'mode]=departures' in request.url else 'arrivals'
+        response = requests.Response()
+        response.status_code = 200
+        response._content = self.bodies[mode]
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+def measure(fn, repeat, per_call_items=1):
+    """Call fn() ``repeat`` times and summarize per-call wall time."""
+    fn()  # warm-up
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    median = statistics.median(samples)
+    return {
+        'repeat': repeat,
+        'min_ms': min(samples) * 1000,
+        'median_ms': median * 1000,
+        'mean_ms': statistics.fmean(samples) * 1000,
+        'items': per_call_items,
+        'items_per_sec': per_call_items / median if median else None,
+    }
+
+def build_payloads(size, now, captures):
+    if captures:
+        recorded = {}
+        for mode, payload in recorded_payloads(captures):
+            recorded.setdefault(mode, payload)
+        return {mode: scale_payload(mode, recorded[mode], size) for mode in DIRECTIONS if mode in recorded}
+    return {mode: synthetic_payload(mode, size, now) for mode in DIRECTIONS}
+
+def install_canned_session(bodies):
+    session = requests.Session()
+    adapter = CannedAdapter(bodies)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    flight_data_fetcher._session = session
+    # Nothing goes over the network, so don't pace requests
+    flight_data_fetcher._rate_limiter = RateLimiter(1e9)
+
+def bench_fetch_parse(board, repeat):
+    """fetch_flight_data end to end over an in-memory transport: JSON decode + parse + sort."""
+    return measure(lambda: flight_data_fetcher.fetch_flight_data(board.code, board.config, board.flight_state), repeat)
+
+def peak_memory_kb(fn):
+    """Peak Python heap allocated while fn() runs, in KB."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+def bench_json_decode(bodies, repeat):
+    """Baseline: decode each response in full with json, as response.json() does, and pick out the schedule."""
+    def decode():
+        for mode, body in bodies.items():
+            json.loads(body)['result']['response']['airport']['pluginData']['schedule'][mode]
+    return dict(measure(decode, repeat, len(bodies)), peak_kb=peak_memory_kb(decode))
+
+def bench_schedule_decode(bodies, repeat):
+    """extract_schedule as the fetcher runs it, decoding with orjson."""
+    def decode():
+        for mode, body in bodies.items():
+            flight_data_fetcher.extract_schedule(body, mode)
+    return dict(measure(decode, repeat, len(bodies)), peak_kb=peak_memory_kb(decode))
+
+def bench_aircraft_lookup(records, repeat):
+    codes = [record.aircraft for record in records]
+    service = board_app.aircraft_data_service
+    return measure(lambda: [service.get_aircraft_name(code) for code in codes], repeat, len(codes))
+
+def bench_logo_lookup(records, repeat):
+    pairs = [(record.carrier, record.flight) for record in records]
+    resolve = board_app.carrier_logo_filename
+    return measure(lambda: [resolve(carrier, flight) for carrier, flight in pairs], repeat, len(pairs))
+
+def bench_render(board, repeat):
+    """Full index.html render, bypassing the per-version page cache."""
+    def render():
+        board.page_cache.clear()
+        with board_app.app.test_request_context('/'):
+            board_app.render_board(board)
+    return measure(render, repeat)
+
+def bench_cached_index(client, repeat):
+    """GET / served from the pre-rendered page cache."""
+    return measure(lambda: client.get('/', headers={'Accept-Encoding': 'gzip'}), repeat)
+
+def bench_status_throughput(clients, duration):
+    """Requests per second against /api/status on a threaded server with concurrent clients."""
+    server = make_server('127.0.0.1', 0, board_app.app, threaded=True, request_handler=QuietRequestHandler)
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+    url = f'http://127.0.0.1:{server.server_port}/api/status'
+    counts = [0] * clients
+    latencies = [[] for _ in range(clients)]
+    deadline = time.perf_counter() + duration
+
+    def client(index):
+        session = requests.Session()
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            session.get(url).raise_for_status()
+            latencies[index].append(time.perf_counter() - started)
+            counts[index] += 1
+
+    threads = [threading.Thread(target=client, args=(index,)) for index in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    server.shutdown()
+    all_latencies = sorted(latency for per_client in latencies for latency in per_client)
+    return {
+        'clients': clients,
+        'duration_s': elapsed,
+        'requests': sum(counts),
+        'requests_per_sec': sum(counts) / elapsed,
+        'p50_ms': all_latencies[len(all_latencies) // 2] * 1000 if all_latencies else None,
+        'p99_ms': all_latencies[int(len(all_latencies) * 0.99)] * 1000 if all_latencies else None,
+    }
+
+def run(sizes, repeat, clients, duration, captures):
+    board = board_app.default_board
+    client = board_app.app.test_client()
+    # Keep synthetic boards out of the real snapshot and flight archive
+    board_app.snapshot_store = None
+    board_app.flight_archive = None
+    now = int(time.time())
+    results = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'source': captures or 'synthetic',
+        'sizes': {},
+    }
+    for size in sizes:
+        payloads = build_payloads(size, now, captures)
+        bodies = {mode: json.dumps(payload).encode() for mode, payload in payloads.items()}
+        install_canned_session(bodies)
+        board.config['board_max_rows'] = size
+        # Fewer repetitions for big boards so a full run stays around a minute
+        size_repeat = max(3, repeat * 100 // size)
+        print(f"Benchmarking {size} flights per direction ({size_repeat} repetitions)...")
+
+        board_app.refresh_flight_data(board)
+        records = board.flight_data['arrivals'] + board.flight_data['departures']
+        results['sizes'][str(size)] = {
+            'flights': len(records),
+            'decode_json': bench_json_decode(bodies, size_repeat),
+            'decode_schedule': bench_schedule_decode(bodies, size_repeat),
+            'fetch_parse': bench_fetch_parse(board, size_repeat),
+            'aircraft_lookup': bench_aircraft_lookup(records, size_repeat),
+            'logo_lookup': bench_logo_lookup(records, size_repeat),
+            'render_index': bench_render(board, size_repeat),
+            'cached_index': bench_cached_index(client, size_repeat),
+        }
+    print(f"Benchmarking /api/status with {clients} concurrent clients for {duration}s...")
+    results['api_status'] = bench_status_throughput(clients, duration)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='flights per direction')
+    parser.add_argument('--repeat', type=int, default=20, help='repetitions at 100 flights (scaled down for larger sizes)')
+    parser.add_argument('--clients', type=int, default=8, help='concurrent /api/status clients')
+    parser.add_argument('--duration', type=float, default=5.0, help='seconds to run the /api/status load')
+    parser.add_argument('--captures', help='capture directory to scale recorded responses from instead of synthetic data')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='where to write the JSON results')
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.repeat, args.clients, args.duration, args.captures)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as output_file:
+        json.dump(results, output_file, indent=2)
+
+    for size, benches in results['sizes'].items():
+        for name, stats in benches.items():
+            if isinstance(stats, dict):
+                print(f"{size:>6} {name:<16} median {stats['median_ms']:9.2f} ms")
+    status = results['api_status']
+    print(f"/api/status: {status['requests_per_sec']:.0f} req/s, p99 {status['p99_ms']:.1f} ms")
+    print(f"Results written to {args.output}")
+
+if __name__ == '__main__':
+    main()
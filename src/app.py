@@ -1,16 +1,27 @@
-from flask import Flask, render_template, jsonify # type: ignore
+from flask import Flask, Response, abort, g, render_template, jsonify, request, send_file # type: ignore
 from services.flight_data_fetcher import fetch_flight_data
 from services.aircraft_data_service import AircraftDataService
-import threading
-import time
+from services.carrier_logo_service import CarrierLogoService
+from services.airport_board import AirportBoard, airport_configs
+from services.board_history import BOARD_DIRECTIONS
+from services.board_snapshot import EMPTY_FLIGHT_DATA
+from services.fetch_scheduler import FetchScheduler
+from services.circuit_breaker import backoff_delay
+from services.metrics import REGISTRY
+from services.snapshot_store import SnapshotStore
+from services.flight_archive import FlightArchive
+from services.preview_image import PreviewRenderer
+from services.static_assets import StaticAssets, ASSET_MAX_AGE
+from services.log_config import configure_logging
 import json
+import logging
 import os
 import sys
-import traceback
-from datetime import datetime
-import pytz # type: ignore
+import threading
+import time
 
 app = Flask(__name__)
+logger = logging.getLogger(__name__)
 
 # Get the absolute path to the project directory
 project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -19,126 +30,253 @@ config_path = os.path.join(project_dir, 'config.json')
 try:
     with open(config_path) as config_file:
         config = json.load(config_file)
-    print(f"Successfully loaded config from {config_path}")
-    print(f"Config contents: {config}")
 except Exception as e:
-    print(f"Error loading config from {config_path}: {e}")
-    sys.exit(1)
+    sys.exit(f"Error loading config from {config_path}: {e}")
+
+# Set up before anything logs; the config itself is never logged since it holds the API key
+configure_logging(config.get('logging'))
+logger.info("Loaded config from %s", config_path)
 
 # Initialize services
 aircraft_data_service = AircraftDataService(config)
+carrier_logo_service = CarrierLogoService(os.path.join(project_dir, 'src', 'static', 'images'))
+# Content-hashed static files and downscaled carrier logos, served from /assets/
+static_assets = StaticAssets(os.path.join(project_dir, 'src', 'static'), os.path.join(project_dir, 'data', 'assets'))
+
+# One board per configured airport, keyed by upper-case airport code
+airport_boards = {}
+for airport_config in airport_configs(config):
+    board = AirportBoard(airport_config)
+    airport_boards[board.code.upper()] = board
+default_board = next(iter(airport_boards.values()))
+
+# Boards and flight tracking state are saved here after every update
+# and reloaded at startup; set "snapshot_path" to "" to turn this off
+snapshot_path = config.get('snapshot_path', os.path.join(project_dir, 'data', 'board_snapshot.json'))
+snapshot_store = SnapshotStore(snapshot_path) if snapshot_path else None
+
+# Open Graph preview images; the logo and font can be set in a "preview" block
+preview_config = config.get('preview', {})
+preview_renderer = PreviewRenderer(
+    os.path.join(project_dir, 'data', 'previews'),
+    logo_path=os.path.join(project_dir, 'src', 'static', 'images', preview_config.get('logo', 'monmouth-jet-center-logo.png')),
+    font_path=preview_config.get('font'))
+
+# Every flight seen is archived here for /api/history; set "archive_path" to "" to turn this off
+archive_path = config.get('archive_path', os.path.join(project_dir, 'data', 'flight_archive.sqlite3'))
+flight_archive = FlightArchive(archive_path) if archive_path else None
+
+def refresh_flight_data(board):
+    """Run one fetch cycle for an airport and publish the result as a new board version.
 
-flight_data = {"departures": [], "arrivals": []}
-last_successful_update = None
-error_message = None
+    Returns the delay in seconds until the next fetch when it should differ from
+    the normal refresh interval (backoff after failures, or an open circuit).
+    """
+    if not board.circuit_breaker.allow():
+        # Upstream is known to be failing: don't tie up a thread in another timeout
+        logger.info("Circuit open for %s; skipping fetch", board.code)
+        if board.has_expired_data():
+            publish_board(board, flight_data=EMPTY_FLIGHT_DATA)
+        return board.circuit_breaker.retry_after()
 
-def update_flight_data():
-    global flight_data, last_successful_update, error_message
-    while True:
+    delay = None
+    policy = board.polling_policy
+    try:
+        new_data = fetch_flight_data(board.code, board.config, board.flight_state,
+                                     on_requests=policy.record_calls if policy else None)
+        reload_local_data()
+        changes = dict(flight_data=new_data, last_successful_update=board.time_format_service.now(),
+                       last_success_time=time.time(), error_message=None)
+        board.circuit_breaker.record_success()
+        logger.info("Updated flight data for %s: %d departures, %d arrivals",
+                    board.code, len(new_data['departures']), len(new_data['arrivals']))
+    except Exception as e:
+        logger.exception("Error updating flight data for %s: %s", board.code, e)
+        changes = dict(error_message=str(e))
+        board.circuit_breaker.record_failure()
+        # Keep serving the last good board until it is too old to trust
+        if board.has_expired_data():
+            changes['flight_data'] = EMPTY_FLIGHT_DATA
+        delay = max(backoff_delay(board.refresh_interval, board.circuit_breaker.consecutive_failures, board.max_backoff),
+                    board.circuit_breaker.retry_after(),
+                    policy.budget_delay() if policy else 0)
+        logger.info("Next fetch for %s in %.0fs", board.code, delay)
+
+    state = publish_board(board, **changes)
+    if delay is None:
+        if flight_archive:
+            flight_archive.record(board.code.upper(), state.flight_data, state.last_success_time)
+    if delay is None and policy:
+        records = state.flight_data['departures'] + state.flight_data['arrivals']
+        delay = policy.next_interval(records, board.history.changed_since(state.version - 1))
+        logger.debug("Next fetch for %s in %.0fs", board.code, delay)
+    return delay
+
+def reload_local_data():
+    """Pick up edits to the aircraft CSV, the logo directory and hashed static files."""
+    aircraft_data_service.reload_if_changed()
+    carrier_logo_service.refresh()
+    static_assets.refresh()
+
+def publish_board(board, **changes):
+    """Publish a new version of the board with ``changes`` applied; returns its BoardSnapshot."""
+    state = board.publish(**changes)
+    board.history.publish(state.version, board_rows(state.flight_data))
+    publish_board_event(board, state)
+    save_snapshot()
+    return state
+
+def save_snapshot():
+    if snapshot_store is None:
+        return
+    try:
+        snapshot_store.save(lambda: {code: board.snapshot() for code, board in airport_boards.items()})
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning("Could not save board snapshot: %s", e)
+
+def restore_snapshot():
+    """Reload boards and flight tracking state saved by a previous run."""
+    snapshot = snapshot_store.load() if snapshot_store else None
+    if snapshot is None:
+        return
+    for code, board_snapshot in snapshot.get('boards', {}).items():
+        board = airport_boards.get(code)
+        if board is None:
+            continue
         try:
-            print("Fetching flight data...")
-            new_data = fetch_flight_data(config["airport_code"], config)
-            flight_data = new_data
-            
-            # Get current time in EDT timezone
-            eastern = pytz.timezone('America/New_York')
-            now = datetime.now(eastern)
-            last_successful_update = now.strftime("%-I:%M %p")  # No leading zeros
-            
-            error_message = None
-            print(f"Updated flight data: {len(flight_data['departures'])} departures, {len(flight_data['arrivals'])} arrivals")
-        except Exception as e:
-            print(f"ERROR updating flight data: {str(e)}")
-            error_message = str(e)
-            traceback.print_exc()
-        
-        # Sleep for the configured interval
-        time.sleep(config.get("refresh_interval", 60))
+            restored = board.restore(board_snapshot)
+        except (KeyError, TypeError) as e:
+            logger.warning("Ignoring unreadable snapshot for %s: %s", code, e)
+            continue
+        if restored:
+            state = board.state
+            board.history.publish(state.version, board_rows(state.flight_data))
+            logger.info("Restored %s board from snapshot (%s)", code, state.last_successful_update)
+
+def follow_snapshots(poll_interval=None):
+    """Mirror the boards a separate fetcher process publishes to the snapshot file, without fetching.
+
+    For WSGI workers (see wsgi.py): every worker serves the same boards and
+    pushes the same live updates while only the fetcher calls FlightRadar24.
+    """
+    if snapshot_store is None:
+        raise RuntimeError('Following a fetcher process needs "snapshot_path" to be set')
+    poll_interval = poll_interval or config.get('snapshot_poll_interval', 1)
+
+    def follow_forever():
+        while True:
+            try:
+                # Workers never fetch, so this is where they notice local file edits
+                reload_local_data()
+                if snapshot_store.changed():
+                    apply_snapshot(snapshot_store.load())
+            except Exception:
+                logger.exception("Could not follow board snapshot")
+            time.sleep(poll_interval)
+
+    thread = threading.Thread(target=follow_forever, name='snapshot-follower', daemon=True)
+    thread.start()
+    return thread
+
+# Writer id of the last snapshot applied by follow_snapshots()
+followed_writer = None
+
+def apply_snapshot(snapshot):
+    global followed_writer
+    if snapshot is None:
+        return
+    # A restarted fetcher may publish lower versions than the ones followed so far
+    restarted = snapshot.get('writer') != followed_writer
+    followed_writer = snapshot.get('writer')
+    for code, board_snapshot in snapshot.get('boards', {}).items():
+        board = airport_boards.get(code)
+        if board is None:
+            continue
+        # A board restored at import time has the same version but none of the
+        # fetcher's status, so only skip versions this process already follows
+        if board_snapshot['version'] == board.state.version and board.state.fetch_status is not None:
+            continue
+        if board_snapshot['version'] < board.state.version and not restarted:
+            continue
+        board.follow(board_snapshot)
+        state = board.state
+        board.history.publish(state.version, board_rows(state.flight_data))
+        publish_board_event(board, state)
+
+RENDER_SECONDS = REGISTRY.histogram('board_render_seconds', 'Board template render time in seconds', ('airport',))
+REQUEST_SECONDS = REGISTRY.histogram('http_request_duration_seconds', 'HTTP request latency in seconds by route', ('route',))
+RESPONSES = REGISTRY.counter('http_responses_total', 'HTTP responses by route and status', ('route', 'status'))
+REGISTRY.function(
+    'board_seconds_since_last_update', 'Seconds since the last successful fetch (since startup before the first)',
+    lambda: {(code,): board.seconds_since_update() for code, board in airport_boards.items()}, ('airport',))
+REGISTRY.function(
+    'board_version', 'Current board version (update cycles completed)',
+    lambda: {(code,): board.state.version for code, board in airport_boards.items()}, ('airport',))
+REGISTRY.function(
+    'fr24_circuit_open', 'Whether fetching for the airport is paused by an open circuit breaker',
+    lambda: {(code,): int(board.fetch_status()['circuit'] == 'open') for code, board in airport_boards.items()}, ('airport',))
+REGISTRY.function(
+    'board_poll_interval_seconds', 'Delay the adaptive poller chose before the next fetch',
+    lambda: {(code,): board.fetch_status()['poll_interval'] for code, board in airport_boards.items()}, ('airport',))
+REGISTRY.function(
+    'fr24_api_calls_today', 'FlightRadar24 API calls made since local midnight',
+    lambda: {(code,): status['api_calls_today'] for code, status in
+             ((code, board.fetch_status()) for code, board in airport_boards.items())
+             if status['api_calls_today'] is not None},
+    ('airport',))
+REGISTRY.function(
+    'board_tracked_flights', 'Cancelled/diverted and landed flights being remembered between fetches',
+    lambda: {(code, kind): count for code, board in airport_boards.items() for kind, count in board.flight_state.counts().items()},
+    ('airport', 'state'))
+REGISTRY.function(
+    'board_stream_clients', 'Screens connected to the live update stream',
+    lambda: {(code,): board.broadcaster.client_count for code, board in airport_boards.items()}, ('airport',))
+
+def _lookup_cache_samples():
+    samples = {}
+    for cache, service in (('aircraft', aircraft_data_service), ('logo', carrier_logo_service)):
+        lookups, misses = service.lookup_count, service.slow_lookup_count
+        samples[(cache, 'hit')] = lookups - misses
+        samples[(cache, 'miss')] = misses
+    return samples
+
+REGISTRY.function(
+    'board_lookup_cache_total', 'Aircraft name and carrier logo lookups by cache result',
+    _lookup_cache_samples, ('cache', 'result'), type='counter')
+
+def publish_board_event(board, state):
+    """Push a newly published board version to connected screens, with the delta from the previous one."""
+    version = state.version
+    event = dict(board.status_fields(state), version=version)
+    changes = board.history.diff(version - 1, version)
+    if changes is not None:
+        event.update(changes, since=version - 1)
+    board.broadcaster.publish('board', json.dumps(event))
+
+# A single scheduler thread staggers fetches for every airport and never runs
+# two fetches for the same airport at once
+fetch_scheduler = FetchScheduler(lambda code: refresh_flight_data(airport_boards[code]),
+                                 interval=config.get("refresh_interval", 60))
+
+def start_background_updates():
+    fetch_scheduler.add_staggered({code: board.refresh_interval for code, board in airport_boards.items()})
+    return fetch_scheduler.start()
 
 # Register the filter using the decorator approach
 @app.template_filter('carrier_logo')
 def carrier_logo_filename(carrier, flight=None):
     """Find logo for carrier if it exists, otherwise try callsign prefix, then return empty string"""
-    # Map common carriers to their logo filenames
-    mapping = {
-        'NetJets': 'netjets.png',
-        'Vista America': 'vistajet.png',
-        'Flexjet': 'flexjet.png',
-        'flyExclusive': 'flyexclusive.png',
-        'Red Wing Aviation': 'redwingaviation.png',
-        'Wheels Up': 'wheelsup.png',
-        'Silver Air': 'silverair.png',
-        'XOJET': 'xojet.png',
-        'Baker Aviation': 'bakeraviation.png',
-        'PlaneSense': 'planesense.png',
-        'Ventura': 'ventura.png',
-        'Pacific Coast Jet': 'pacificcoastjet.png',
-        'Global Air Charters': 'globalaircharters.png',
-        'Private Jet Center': 'privatejetcenter.png',
-        'Executive Fliteways': 'executivefliteways.png',
-        'Tradewind Aviation': 'tradewindaviation.png',
-        'Aero-Tech Services': 'aerotechservices.png',
-        'Shoreline Aviation': 'shorelineaviation.png',
-        'Northern Jet Management': 'northernjetmanagement.png',
-        'Aircraft Management Group': 'aircraftmanagementgroup.png',
-        'Fly Alliance': 'flyalliance.png',
-        'Air Methods': 'airmethods.png',
-        'Mountain Aviation': 'mountainaviation.png',
-        'Jet Linx Aviation': 'jetlinxaviation.png',
-        'Thrive': 'thrive.png',
-        'Jet Aviation Flight Services': 'jetaviation.png',
-        'Fltplan': 'fltplan.png',
-        'Hera Flight': 'heraflight.png',
-        'Presidential Aviation': 'presidentialaviation.png',
-        'NEAJETS': 'neajets.png',
-        'Trident Aircraft': 'tridentaircraft.png',
-        'East Coast Jets': 'eastcoastjets.png',
-        'ATI Jet': 'jetvia.png',
-        'Jetvia': 'jetvia.png',
-        'STAjets': 'stajets.png',
-        'Carlisle Air Group': 'carlisleairgroup.png',
-        'Hop-A-Jet': 'hopajet.png',
-        'Journey Aviation': 'journeyaviation.png',
-        'Executive Jet Management': 'ejm.png',
-        'BellAir': 'bellair.png',
-        'NexGen Aviation': 'nexgenaviation.png',
-        'Flight Options': 'flightoptions.png',
-        'Worldwide Jet Charter': 'worldwidejetcharter.png',
-        # Add more mappings as needed
-    }
-    
-    # Map callsign prefixes to logo filenames
-    callsign_prefix_mapping = {
-        'LFG': 'letsjett.png',
-        'JNY': 'journeyaviation.png',
-        'JTL': 'jetlinxaviation.png',
-    }
-    
-    # First try with carrier name if provided
-    filename = None
-    if carrier:
-        # Look for the carrier in our mapping
-        filename = mapping.get(carrier, carrier.lower().replace(' ', '') + '.png')
-        
-        # Check if file exists in static directory
-        static_path = os.path.join(project_dir, 'src', 'static', 'images', filename)
-        if os.path.exists(static_path):
-            return filename
-    
-    # If no carrier provided or no logo found with carrier name, try callsign prefix
-    if flight:
-        # Extract callsign prefix (first 3 characters)
-        if isinstance(flight, str) and len(flight) >= 3:
-            prefix = flight[:3].upper()
-            if prefix in callsign_prefix_mapping:
-                filename = callsign_prefix_mapping[prefix]
-                static_path = os.path.join(project_dir, 'src', 'static', 'images', filename)
-                if os.path.exists(static_path):
-                    return filename
-    
-    # If no logo found, return empty string but don't filter out the flight
-    print(f"No logo found for carrier: {carrier}, flight: {flight}")
-    return ''
+    return carrier_logo_service.get_logo(carrier, flight)
+
+@app.template_filter('logo_url')
+def logo_url(logo):
+    """Cacheable URL of a carrier logo's board-sized variant"""
+    return static_assets.logo_url(logo)
+
+@app.template_global('asset_url')
+def asset_url(filename):
+    """Content-hashed URL for a file under static/"""
+    return static_assets.url(filename)
 
 @app.template_filter('aircraft_name')
 def aircraft_fullname(code):
@@ -148,74 +286,241 @@ def aircraft_fullname(code):
         
     return aircraft_data_service.get_aircraft_name(code)
 
+def send_rendered_page(page, cache_control='no-cache'):
+    """Serve a pre-rendered page, honoring If-None-Match and Accept-Encoding."""
+    if request.if_none_match.contains(page.etag):
+        response = Response(status=304)
+    else:
+        encoding, body = page.variant(request.accept_encodings)
+        response = Response(body, mimetype=page.mimetype)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(page.etag)
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = cache_control
+    return response
+
+def preview_lines(board, state):
+    """Text for a board's preview image: configured title and subtitle, then live counts."""
+    preview_config = board.config.get('preview', {})
+    title = preview_config.get('title') or (f"{board.code} - {board.name}" if board.code else board.name)
+    counts = f"{len(state.flight_data['departures'])} departures  |  {len(state.flight_data['arrivals'])} arrivals"
+    return (
+        (title, 60, (82, 107, 132)),
+        (preview_config.get('subtitle', 'Flight Board'), 60, (255, 255, 255)),
+        (counts, 40, (200, 200, 200)),
+        (f"Updated {board.last_update_display(state)}", 32, (140, 140, 140)),
+    )
+
+def board_row(record):
+    """Serialize a FlightRecord for the board API, with display lookups resolved."""
+    row = record.to_dict()
+    row['aircraft_name'] = aircraft_fullname(record.aircraft) if record.aircraft else ''
+    row['logo'] = carrier_logo_filename(record.carrier, record.flight)
+    row['logo_url'] = logo_url(row['logo'])
+    return row
+
+def board_rows(board):
+    return {direction: [board_row(record) for record in board.get(direction, [])] for direction in BOARD_DIRECTIONS}
+
+def board_json_rows(board, state):
+    """{'version': n, direction: [row dict, ...]} for the version in ``state``."""
+    rows = board.history.rows(state.version)
+    if rows is None:
+        # Published but not in the history yet (or already dropped from it)
+        rows = dict(board_rows(state.flight_data), version=state.version)
+    return rows
+
+def get_board(code=None):
+    """Look up an airport board by code (default airport if none given), or 404."""
+    if not code:
+        return default_board
+    board = airport_boards.get(code.upper())
+    if board is None:
+        abort(404)
+    return board
+
+def public_url():
+    """Site URL (with trailing slash) for share links: "public_url" in config, else a relative one.
+
+    The rendered page is cached and shared by every request, so it never
+    carries the Host header of whichever request rendered it.
+    """
+    return config.get('public_url', request.script_root).rstrip('/') + '/'
+
+def render_board(board):
+    # One snapshot for the whole page, so rows and status always come from the same version
+    state = board.state
+    status = board.status_fields(state)
+
+    def render():
+        with RENDER_SECONDS.time(airport=board.code):
+            return render_template('index.html', 
+                                   flights=state.flight_data, 
+                                   airport_code=board.code,
+                                   airport_name=board.name,
+                                   last_update=status['last_update'],
+                                   stale_minutes=status['stale_minutes'],
+                                   board_version=state.version,
+                                   refresh_interval=board.refresh_interval,
+                                   public_url=public_url(),
+                                   error=status['error'])
+
+    page = board.page_cache.get((state.version, status['last_update'], status['stale_minutes']), render)
+    return send_rendered_page(page)
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    started = g.get('request_started')
+    if started is not None:
+        REQUEST_SECONDS.observe(time.perf_counter() - started, route=route)
+    RESPONSES.inc(route=route, status=response.status_code)
+    return response
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus text-format metrics."""
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/')
 def index():
-    # Get current time in EDT timezone
-    eastern = pytz.timezone('America/New_York')
-    now = datetime.now(eastern)
-    current_time = now.strftime("%-I:%M %p")  # No leading zeros
-    
-    return render_template('index.html', 
-                          flights=flight_data, 
-                          airport_code=config.get("airport_code", "KBLM"),
-                          last_update=last_successful_update or current_time,
-                          error=error_message)
+    return render_board(default_board)
+
+@app.route('/board/<code>')
+def airport_board(code):
+    return render_board(get_board(code))
+
+@app.route('/api/board')
+def api_board():
+    """Normalized board as JSON; with ?since=<version> only the rows that changed."""
+    board = get_board(request.args.get('airport'))
+    # One snapshot for the whole response, so rows, diff and status share a version
+    state = board.state
+    status = board.status_fields(state)
+    since = request.args.get('since', type=int)
+    changes = board.history.diff(since, state.version) if since is not None else None
+    if changes is None:
+        # Full boards are identical for every screen, so serialize them once per version
+        page = board.json_cache.get(
+            (state.version, status['last_update'], status['stale_minutes']),
+            lambda: json.dumps(dict(board_json_rows(board, state), full=True, **status)),
+            mimetype='application/json')
+        return send_rendered_page(page)
+    return jsonify(dict(changes, full=False, **status))
+
+@app.route('/stream')
+def stream():
+    """Server-Sent Events channel announcing each new board version."""
+    board = get_board(request.args.get('airport'))
+    subscription = board.broadcaster.subscribe()
+    if subscription is None:
+        return jsonify({'error': 'Too many connected screens'}), 503
+    return Response(board.broadcaster.stream(subscription),
+                    mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 @app.route('/preview-image')
 def preview_image():
-    """Generate a preview image for social sharing"""
-    from flask import send_file # type: ignore
-    from PIL import Image, ImageDraw, ImageFont # type: ignore
-    import io
-    
-    # Create a new image with your site's appearance
-    width, height = 1200, 630  # Standard OG image size
-    img = Image.new('RGB', (width, height), color=(26, 26, 26))
-    draw = ImageDraw.Draw(img)
-    
-    # Try to load fonts (fallback to default if not available)
-    try:
-        title_font = ImageFont.truetype('Arial.ttf', 60)
-        subtitle_font = ImageFont.truetype('Arial.ttf', 40)
-    except IOError:
-        title_font = ImageFont.load_default()
-        subtitle_font = ImageFont.load_default()
-    
-    # Add text
-    draw.text((60, 180), 'KBLM - Monmouth Executive Airport', fill=(82, 107, 132), font=title_font)
-    draw.text((60, 280), 'Flight Board', fill=(255, 255, 255), font=title_font)
-    
-    # Try to add logo
-    try:
-        logo = Image.open(os.path.join(project_dir, 'src', 'static', 'images', 'monmouth-jet-center-logo.png'))
-        logo = logo.resize((200, 200))
-        img.paste(logo, (width - 280, 60), logo if logo.mode == 'RGBA' else None)
-    except Exception as e:
-        print(f"Could not add logo to preview: {e}")
-    
-    # Save to bytes
-    img_io = io.BytesIO()
-    img.save(img_io, 'PNG')
-    img_io.seek(0)
-    
-    return send_file(img_io, mimetype='image/png')
+    """Open Graph preview image for social sharing, drawn once per board version."""
+    board = get_board(request.args.get('airport'))
+    if not preview_renderer.available:
+        abort(404)
+    state = board.state
+    page = board.preview_cache.get(state.version, lambda: preview_renderer.render(preview_lines(board, state)),
+                                   mimetype='image/png', compress=False)
+    return send_rendered_page(page, cache_control=f'public, max-age={board.refresh_interval}')
+
+@app.route('/assets/<path:name>')
+def asset(name):
+    """Static files and logo variants by content-hashed name; their content never changes."""
+    path = static_assets.resolve(name)
+    if path is None:
+        abort(404)
+    response = send_file(path, max_age=ASSET_MAX_AGE)
+    response.headers['Cache-Control'] = f'public, max-age={ASSET_MAX_AGE}, immutable'
+    return response
 
 @app.route('/api/status')
 def api_status():
+    board = get_board(request.args.get('airport'))
+    state = board.state
     return jsonify({
-        'status': 'ok' if error_message is None else 'error',
-        'last_update': last_successful_update,
-        'error': error_message,
+        'airport': board.code,
+        'status': 'ok' if state.error_message is None else ('stale' if board.display_error(state) is None else 'error'),
+        'last_update': state.last_successful_update,
+        'error': state.error_message,
+        'data_age': state.data_age(),
+        **board.fetch_status(),
         'count': {
-            'departures': len(flight_data['departures']),
-            'arrivals': len(flight_data['arrivals'])
+            'departures': len(state.flight_data['departures']),
+            'arrivals': len(state.flight_data['arrivals'])
         }
     })
 
+@app.route('/api/weather')
+def api_weather():
+    """Current weather at the airport, shared by every screen and refreshed at most once per TTL."""
+    board = get_board(request.args.get('airport'))
+    weather = board.weather.get()
+    if weather is None:
+        return jsonify({'error': 'Weather unavailable'}), 503
+    icon = weather.pop('icon')
+    weather['icon_url'] = asset_url(f'images/weather/{icon}.svg') if icon else None
+    response = jsonify(weather)
+    response.headers['Cache-Control'] = 'max-age=60'
+    return response
+
+@app.route('/api/history')
+def api_history():
+    """Archived flights scheduled in [from, to) (epoch seconds, default 24 hours either side of now), oldest first.
+
+    Filters: airport, direction, carrier, registration. Pages hold up to
+    ``limit`` flights; pass the returned ``next_cursor`` as ``cursor`` for the next.
+    """
+    if flight_archive is None:
+        abort(404)
+    now = int(time.time())
+    # Upcoming flights are archived as soon as they appear on the board
+    end = request.args.get('to', now + 86400, type=int)
+    start = request.args.get('from', now - 86400, type=int)
+    after = None
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            timestamp, rowid = (int(part) for part in cursor.split(':'))
+        except ValueError:
+            abort(400)
+        after = (timestamp, rowid)
+    airport = request.args.get('airport')
+    try:
+        flights, next_cursor = flight_archive.query(
+            start, end,
+            airport=airport.upper() if airport else None,
+            direction=request.args.get('direction'),
+            carrier=request.args.get('carrier'),
+            registration=request.args.get('registration'),
+            limit=request.args.get('limit', 100, type=int),
+            after=after)
+    except ValueError:
+        abort(400)
+    return jsonify({
+        'from': start,
+        'to': end,
+        'flights': flights,
+        'next_cursor': f"{next_cursor[0]}:{next_cursor[1]}" if next_cursor else None,
+    })
+
+# Serve the last saved boards right away instead of blank ones until the first fetch
+restore_snapshot()
+
 if __name__ == '__main__':
-    # Start the background thread for fetching data
-    data_thread = threading.Thread(target=update_flight_data, daemon=True)
-    data_thread.start()
+    # Start the background scheduler for fetching data
+    start_background_updates()
     
     # Run the Flask application
     app.run(debug=True, host='0.0.0.0')
\ No newline at end of file
@@ -0,0 +1,54 @@
+"""Fetch-only process for production serving.
+
+Polls FlightRadar24 for every configured airport and publishes each board
+version to the snapshot file, which the web workers started from wsgi.py
+follow. Run exactly one of these next to any number of workers:
+
+    python src/fetcher.py
+
+The FlightRadar24 request and parse metrics only exist in this process, so
+it serves its own /metrics on "fetcher_metrics_port" (default 9108, 0 turns
+it off).
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import logging
+import threading
+
+from app import config, start_background_updates
+from services.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_METRICS_PORT = 9108
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Serves REGISTRY in the Prometheus text format at /metrics."""
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("%s %s", self.address_string(), format % args)
+
+def serve_metrics(port):
+    """Serve /metrics on ``port`` from a daemon thread; returns the server."""
+    server = ThreadingHTTPServer(('0.0.0.0', port), MetricsHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True)
+    thread.start()
+    logger.info("Serving fetcher metrics on port %s", server.server_address[1])
+    return server
+
+if __name__ == '__main__':
+    metrics_port = config.get('fetcher_metrics_port', DEFAULT_METRICS_PORT)
+    if metrics_port:
+        serve_metrics(metrics_port)
+    start_background_updates().join()
@@ -1,7 +1,10 @@
 import os
 import csv
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
 class AircraftDataService:
     def __init__(self, config=None):
         # config is kept for potential future use
@@ -12,17 +15,46 @@ class AircraftDataService:
         # Navigate up from services to src, then into static
         self.csv_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static', csv_filename)
         
-        # Load aircraft data from CSV
-        self.aircraft_data = self._load_aircraft_data()
-        print(f"Initialized AircraftDataService with {len(self.aircraft_data)} aircraft mappings from CSV.")
-        
+        # Lookup statistics for metrics: every call, and calls that missed the lookup table
+        self.lookup_count = 0
+        self.slow_lookup_count = 0
+
+        # Load aircraft data from CSV and precompute display names
+        self._csv_mtime = None
+        self.reload_if_changed()
+        logger.info("Initialized AircraftDataService with %d aircraft mappings from CSV", len(self.aircraft_data))
+
+    def _csv_modified_time(self):
+        try:
+            return os.stat(self.csv_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def reload_if_changed(self):
+        """Reload the CSV if its mtime changed. Returns True if it was reloaded.
+
+        Meant to be called from the background updater so lookups never touch
+        the filesystem.
+        """
+        mtime = self._csv_modified_time()
+        if self._csv_mtime is not None and mtime == self._csv_mtime:
+            return False
+        aircraft_data = self._load_aircraft_data()
+        # Display names keyed by normalized code, formatted once here instead of per lookup
+        lookup = {code.upper(): self._format_aircraft_name(name) for code, name in aircraft_data.items()}
+        lookup['N/A'] = 'Unknown'
+        # Swap everything at once so concurrent lookups see a consistent table
+        self.aircraft_data, self._lookup, self._misses = aircraft_data, lookup, set()
+        self._csv_mtime = mtime
+        return True
+
     def _load_aircraft_data(self):
         """Load aircraft data from CSV file."""
         aircraft_dict = {}
         try:
             # Check if file exists
             if not os.path.isfile(self.csv_path):
-                print(f"Warning: CSV file not found at {self.csv_path}")
+                logger.warning("CSV file not found at %s", self.csv_path)
                 return {}
                 
             with open(self.csv_path, 'r') as csvfile:
@@ -37,7 +69,7 @@ class AircraftDataService:
                     icao_idx = headers.index('ICAO_Code')
                     model_idx = headers.index('Model_FAA')
                 except ValueError as e:
-                    print(f"Error: Required column not found in CSV: {e}")
+                    logger.error("Required column not found in CSV: %s", e)
                     return {}
                 
                 # Process each row
@@ -50,7 +82,7 @@ class AircraftDataService:
             
             return aircraft_dict
         except Exception as e:
-            print(f"Error loading aircraft data from CSV: {e}")
+            logger.error("Error loading aircraft data from CSV: %s", e)
             # Return an empty dictionary on error
             return {}
     
@@ -79,21 +111,29 @@ class AircraftDataService:
         # If there's only one word, return as is
         return name
         
+    def _resolve_aircraft_name(self, raw_code):
+        """Slow path for codes not yet in the lookup table: normalize and memoize."""
+        self.slow_lookup_count += 1
+        code = raw_code.strip().upper()
+        lookup = self._lookup
+        name = lookup.get(code)
+        if name is None:
+            # If code not found in our dictionary, return the code itself
+            name = code
+            if code not in self._misses:
+                self._misses.add(code)
+                logger.info("Aircraft code '%s' not found in CSV data. Returning code.", code,
+                            extra={'rate_limited': True})
+        # Remember the answer under the raw spelling so the next lookup is one probe
+        lookup[raw_code] = name
+        return name
+
     def get_aircraft_name(self, code):
         """Get full aircraft name from ICAO code using the loaded CSV data."""
-        if not code or code == 'N/A':
+        self.lookup_count += 1
+        if not code:
             return 'Unknown'
-            
-        # Normalize the code
-        code = code.strip().upper()
-        
-        # Look up in the CSV-loaded dictionary
-        name = self.aircraft_data.get(code)
-        
-        if name:
-            # Format the name according to our rules before returning
-            return self._format_aircraft_name(name)
-        else:
-            # If code not found in our dictionary, return the code itself
-            print(f"Aircraft code '{code}' not found in CSV data. Returning code.")
-            return code
\ No newline at end of file
+        name = self._lookup.get(code)
+        if name is None:
+            name = self._resolve_aircraft_name(code)
+        return name
\ No newline at end of file
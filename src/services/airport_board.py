@@ -0,0 +1,170 @@
+import threading
+import time
+
+from services.board_history import BoardHistory
+from services.broadcaster import Broadcaster
+from services.circuit_breaker import CircuitBreaker
+from services.board_snapshot import BoardSnapshot, freeze_flight_data
+from services.flight_state_store import FlightStateStore
+from services.polling_policy import AdaptivePollingPolicy
+from services.render_cache import RenderCache
+from services.time_format_service import get_time_format_service
+from services.weather_service import WeatherService
+
+def airport_configs(config):
+    """Expand config into one merged config per airport.
+
+    ``config["airports"]`` may list several airports, each with its own
+    ``code``, ``name``, ``coordinates`` and ``timezone``. Anything an entry
+    doesn't set is inherited from the top-level config, and a config without
+    an ``airports`` list describes a single airport the original way.
+    """
+    shared = {key: value for key, value in config.items() if key != 'airports'}
+    entries = config.get('airports') or [{}]
+    configs = []
+    for entry in entries:
+        airport_config = dict(shared)
+        airport_config.update({key: value for key, value in entry.items() if key not in ('code', 'name', 'coordinates')})
+        airport_config['airport_code'] = entry.get('code', shared.get('airport_code', ''))
+        airport_config['airport_name'] = entry.get('name', shared.get('airport_name', ''))
+        airport_config['airport_coordinates'] = entry.get('coordinates', shared.get('airport_coordinates'))
+        configs.append(airport_config)
+    return configs
+
+class AirportBoard:
+    """Live state and caches for one airport's board."""
+
+    def __init__(self, airport_config):
+        self.config = airport_config
+        self.code = airport_config.get('airport_code', '')
+        self.name = airport_config.get('airport_name') or self.code
+        self.refresh_interval = airport_config.get('refresh_interval', 60)
+        self.time_format_service = get_time_format_service(airport_config.get('timezone'))
+
+        # Current BoardSnapshot, replaced (never modified) on every update; rendered
+        # pages and API responses are cached per its version
+        self.state = BoardSnapshot.empty()
+        self._publish_lock = threading.Lock()
+        # Epoch seconds of startup, for update lag before the first successful fetch
+        self.started_time = time.time()
+
+        # Cancelled/diverted and landed flights, remembered across fetches
+        self.flight_state = FlightStateStore(airport_config.get('flight_state_ttl'))
+
+        # Keep serving the last good board through upstream failures for this long (seconds)
+        self.max_staleness = airport_config.get('max_staleness', 900)
+        self.max_backoff = airport_config.get('max_backoff', 600)
+        breaker_config = airport_config.get('circuit_breaker', {})
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=breaker_config.get('failure_threshold', 3),
+            reset_timeout=breaker_config.get('reset_timeout', 300))
+        # None when adaptive polling is turned off and the board refreshes every refresh_interval
+        self.polling_policy = AdaptivePollingPolicy.from_config(airport_config, self.time_format_service.tz)
+
+        weather_config = airport_config.get('weather', {})
+        self.weather = WeatherService(
+            self.code,
+            airport_config.get('airport_coordinates'),
+            ttl=weather_config.get('ttl', 600),
+            max_age=weather_config.get('max_age', 3600),
+            temperature_unit=weather_config.get('temperature_unit', 'fahrenheit'))
+
+        self.history = BoardHistory()
+        self.page_cache = RenderCache()
+        self.json_cache = RenderCache()
+        self.preview_cache = RenderCache()
+        stream_config = airport_config.get('stream', {})
+        self.broadcaster = Broadcaster(
+            max_clients=stream_config.get('max_clients', 500),
+            max_queue=stream_config.get('queue_size', 16),
+            heartbeat_interval=stream_config.get('heartbeat_interval', 15))
+
+    @property
+    def flight_data(self):
+        return self.state.flight_data
+
+    @property
+    def version(self):
+        return self.state.version
+
+    def publish(self, **changes):
+        """Swap in a new version of the board with ``changes`` applied; returns the new BoardSnapshot."""
+        with self._publish_lock:
+            if 'flight_data' in changes:
+                changes['flight_data'] = freeze_flight_data(changes['flight_data'])
+            state = self.state._replace(version=self.state.version + 1, **changes)
+            self.state = state
+        return state
+
+    def snapshot(self):
+        """Board state for a warm restart, and for worker processes following this one."""
+        return dict(self.state.to_dict(), fetch_status=self.fetch_status(), flight_state=self.flight_state.export())
+
+    def restore(self, snapshot):
+        """Load a snapshot() taken by an earlier process. Returns False if the board is too old to show."""
+        self.flight_state.restore(snapshot.get('flight_state', {}))
+        if snapshot['last_success_time'] is None or time.time() - snapshot['last_success_time'] > self.max_staleness:
+            return False
+        # This process does its own fetching: start without the old process's error
+        self.state = BoardSnapshot.from_dict(snapshot)._replace(error_message=None, fetch_status=None)
+        return True
+
+    def follow(self, snapshot):
+        """Mirror a snapshot() published by the fetcher process, as is."""
+        self.state = BoardSnapshot.from_dict(snapshot)
+
+    def fetch_status(self):
+        """How this board is being fetched: circuit breaker state, poll interval and calls today."""
+        followed = self.state.fetch_status
+        if followed is not None:
+            return followed
+        policy = self.polling_policy
+        return {
+            'circuit': self.circuit_breaker.state,
+            'poll_interval': policy.interval if policy else self.refresh_interval,
+            'api_calls_today': policy.calls_today if policy else None,
+        }
+
+    def seconds_since_update(self):
+        return time.time() - (self.state.last_success_time or self.started_time)
+
+    # The status helpers below read one BoardSnapshot (the current one by default)
+    # so callers rendering a version can pass the snapshot they took
+
+    def last_update_display(self, state=None):
+        state = state or self.state
+        return state.last_successful_update or self.time_format_service.now()
+
+    def is_expired(self, state=None):
+        age = (state or self.state).data_age()
+        return age is not None and age > self.max_staleness
+
+    def has_expired_data(self):
+        """Whether the board still shows data older than max_staleness, which should be cleared."""
+        state = self.state
+        return self.is_expired(state) and any(state.flight_data.values())
+
+    def display_error(self, state=None):
+        """Error to show on the board: hidden while the last good data is still fresh enough."""
+        state = state or self.state
+        if state.error_message is None:
+            return None
+        if state.last_success_time is None or self.is_expired(state):
+            return state.error_message
+        return None
+
+    def stale_minutes(self, state=None):
+        """Age in minutes of the data being served through an outage, or None if it is current."""
+        state = state or self.state
+        if state.error_message is None or self.display_error(state) is not None:
+            return None
+        return int(state.data_age() // 60)
+
+    def status_fields(self, state=None):
+        """Status shown alongside the rows in the page, the board API and stream events."""
+        state = state or self.state
+        return {
+            'last_update': self.last_update_display(state),
+            'error': self.display_error(state),
+            'stale_minutes': self.stale_minutes(state),
+        }
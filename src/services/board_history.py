@@ -0,0 +1,87 @@
+import threading
+from collections import OrderedDict
+
+BOARD_DIRECTIONS = ('departures', 'arrivals')
+
+class BoardHistory:
+    """Keeps the last few published board versions so screens can fetch deltas.
+
+    Each version is stored as {direction: OrderedDict(key -> row dict)}. Diffs
+    between a retained version and the current one are computed once and shared
+    by every client asking for the same ``since`` version.
+    """
+
+    def __init__(self, max_versions=30):
+        self.max_versions = max_versions
+        self._versions = OrderedDict()
+        self._diffs = {}
+        self._lock = threading.Lock()
+        self.version = 0
+
+    def publish(self, version, board):
+        """Record the rows of a new board version ({direction: [row dict, ...]})."""
+        snapshot = {
+            direction: OrderedDict((row['key'], row) for row in board.get(direction, []))
+            for direction in BOARD_DIRECTIONS
+        }
+        with self._lock:
+            self._versions[version] = snapshot
+            while len(self._versions) > self.max_versions:
+                self._versions.popitem(last=False)
+            self._diffs = {}
+            self.version = version
+
+    def changed_since(self, since):
+        """Whether the latest version's rows or their order differ from version ``since``."""
+        with self._lock:
+            old = self._versions.get(since)
+            new = self._versions.get(self.version)
+        # OrderedDict equality is order-sensitive, so reordered rows count as a change
+        return old is None or new is None or old != new
+
+    def rows(self, version=None):
+        """Return {'version': n, direction: [row dict, ...]} for ``version`` (default
+        the latest), or None if a version that was asked for isn't retained."""
+        with self._lock:
+            if version is None:
+                version = self.version
+            elif version not in self._versions:
+                return None
+            snapshot = self._versions.get(version)
+        board = {'version': version}
+        for direction in BOARD_DIRECTIONS:
+            board[direction] = list(snapshot[direction].values()) if snapshot else []
+        return board
+
+    def diff(self, since, version=None):
+        """Return {'version': n, direction: {added, changed, removed, order}} with
+        the changes from ``since`` to ``version`` (default the latest), or None if
+        either is not retained and the client needs the full board."""
+        with self._lock:
+            if version is None:
+                version = self.version
+            cached = self._diffs.get((since, version))
+            if cached is not None:
+                return cached
+            old = self._versions.get(since)
+            new = self._versions.get(version)
+            if old is None or new is None:
+                return None
+            changes = {'version': version}
+            for direction in BOARD_DIRECTIONS:
+                old_rows, new_rows = old[direction], new[direction]
+                added, changed = [], []
+                for key, row in new_rows.items():
+                    previous = old_rows.get(key)
+                    if previous is None:
+                        added.append(row)
+                    elif previous != row:
+                        changed.append(row)
+                changes[direction] = {
+                    'added': added,
+                    'changed': changed,
+                    'removed': [key for key in old_rows if key not in new_rows],
+                    'order': list(new_rows),
+                }
+            self._diffs[(since, version)] = changes
+            return changes
@@ -0,0 +1,61 @@
+import time
+from collections import namedtuple
+from types import MappingProxyType
+
+from services.flight_records import FlightRecord
+
+def freeze_flight_data(flight_data):
+    """Read-only {direction: tuple of FlightRecords} view for a snapshot."""
+    return MappingProxyType({direction: tuple(records) for direction, records in flight_data.items()})
+
+EMPTY_FLIGHT_DATA = freeze_flight_data({'departures': (), 'arrivals': ()})
+
+_BoardSnapshotFields = namedtuple('BoardSnapshotFields', [
+    'version', 'flight_data', 'last_successful_update', 'last_success_time', 'error_message', 'fetch_status',
+])
+
+class BoardSnapshot(_BoardSnapshotFields):
+    """One published version of a board: its flights and status, never modified.
+
+    The updater builds a new snapshot and swaps it in with one assignment, so
+    a reader that takes ``board.state`` once sees data, timestamps and error
+    from the same version without locking. ``fetch_status`` is only set on
+    boards mirrored from a separate fetcher process.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def empty(cls):
+        return cls(version=0, flight_data=EMPTY_FLIGHT_DATA, last_successful_update=None,
+                   last_success_time=None, error_message=None, fetch_status=None)
+
+    def data_age(self):
+        """Seconds since this data was fetched, or None if there never was any."""
+        if self.last_success_time is None:
+            return None
+        return time.time() - self.last_success_time
+
+    def to_dict(self):
+        """JSON-friendly form for the snapshot file."""
+        return {
+            'version': self.version,
+            'last_successful_update': self.last_successful_update,
+            'last_success_time': self.last_success_time,
+            'error_message': self.error_message,
+            'fetch_status': self.fetch_status,
+            'flight_data': {direction: [record.to_dict() for record in records]
+                            for direction, records in self.flight_data.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            version=data['version'],
+            flight_data=freeze_flight_data({direction: [FlightRecord.from_dict(row) for row in rows]
+                                            for direction, rows in data['flight_data'].items()}),
+            last_successful_update=data['last_successful_update'],
+            last_success_time=data['last_success_time'],
+            error_message=data.get('error_message'),
+            fetch_status=data.get('fetch_status'),
+        )
@@ -0,0 +1,88 @@
+import queue
+import threading
+
+# Sentinel pushed to a subscriber's queue to end its stream
+_CLOSE = object()
+
+class Subscription:
+    """One connected client: a bounded queue of pending SSE messages."""
+
+    __slots__ = ('queue', 'closed')
+
+    def __init__(self, max_queue):
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.closed = False
+
+class Broadcaster:
+    """Fan-out of server-sent events to many connected screens.
+
+    Every subscriber gets a bounded queue. Publishing never blocks: a client
+    whose queue is full is too slow to keep up and gets evicted, and it
+    reconnects and resyncs on its own via EventSource. Idle streams are kept
+    open with periodic comment heartbeats so proxies don't drop them.
+    """
+
+    def __init__(self, max_clients=500, max_queue=16, heartbeat_interval=15, retry_ms=5000):
+        self.max_clients = max_clients
+        self.max_queue = max_queue
+        self.heartbeat_interval = heartbeat_interval
+        self.retry_ms = retry_ms
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self.evicted_count = 0
+
+    @property
+    def client_count(self):
+        return len(self._subscribers)
+
+    def subscribe(self):
+        """Register a new client, or return None if the server is at capacity."""
+        with self._lock:
+            if len(self._subscribers) >= self.max_clients:
+                return None
+            subscription = Subscription(self.max_queue)
+            self._subscribers.add(subscription)
+            return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+        subscription.closed = True
+
+    def _evict(self, subscription):
+        self._subscribers.discard(subscription)
+        subscription.closed = True
+        self.evicted_count += 1
+        # Make room for the close marker so a blocked reader wakes up and exits
+        try:
+            while True:
+                subscription.queue.get_nowait()
+        except queue.Empty:
+            pass
+        subscription.queue.put_nowait(_CLOSE)
+
+    def publish(self, event, data):
+        """Queue an event for every subscriber without blocking."""
+        message = f"event: {event}\ndata: {data}\n\n"
+        with self._lock:
+            for subscription in list(self._subscribers):
+                try:
+                    subscription.queue.put_nowait(message)
+                except queue.Full:
+                    self._evict(subscription)
+
+    def stream(self, subscription):
+        """Yield SSE-formatted messages for one subscriber until it disconnects or is evicted."""
+        try:
+            yield f"retry: {self.retry_ms}\n\n"
+            while not subscription.closed:
+                try:
+                    message = subscription.queue.get(timeout=self.heartbeat_interval)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                if message is _CLOSE:
+                    break
+                yield message
+        finally:
+            self.unsubscribe(subscription)
@@ -0,0 +1,147 @@
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Map common carriers to their logo filenames
+CARRIER_LOGOS = {
+    'NetJets': 'netjets.png',
+    'Vista America': 'vistajet.png',
+    'Flexjet': 'flexjet.png',
+    'flyExclusive': 'flyexclusive.png',
+    'Red Wing Aviation': 'redwingaviation.png',
+    'Wheels Up': 'wheelsup.png',
+    'Silver Air': 'silverair.png',
+    'XOJET': 'xojet.png',
+    'Baker Aviation': 'bakeraviation.png',
+    'PlaneSense': 'planesense.png',
+    'Ventura': 'ventura.png',
+    'Pacific Coast Jet': 'pacificcoastjet.png',
+    'Global Air Charters': 'globalaircharters.png',
+    'Private Jet Center': 'privatejetcenter.png',
+    'Executive Fliteways': 'executivefliteways.png',
+    'Tradewind Aviation': 'tradewindaviation.png',
+    'Aero-Tech Services': 'aerotechservices.png',
+    'Shoreline Aviation': 'shorelineaviation.png',
+    'Northern Jet Management': 'northernjetmanagement.png',
+    'Aircraft Management Group': 'aircraftmanagementgroup.png',
+    'Fly Alliance': 'flyalliance.png',
+    'Air Methods': 'airmethods.png',
+    'Mountain Aviation': 'mountainaviation.png',
+    'Jet Linx Aviation': 'jetlinxaviation.png',
+    'Thrive': 'thrive.png',
+    'Jet Aviation Flight Services': 'jetaviation.png',
+    'Fltplan': 'fltplan.png',
+    'Hera Flight': 'heraflight.png',
+    'Presidential Aviation': 'presidentialaviation.png',
+    'NEAJETS': 'neajets.png',
+    'Trident Aircraft': 'tridentaircraft.png',
+    'East Coast Jets': 'eastcoastjets.png',
+    'ATI Jet': 'jetvia.png',
+    'Jetvia': 'jetvia.png',
+    'STAjets': 'stajets.png',
+    'Carlisle Air Group': 'carlisleairgroup.png',
+    'Hop-A-Jet': 'hopajet.png',
+    'Journey Aviation': 'journeyaviation.png',
+    'Executive Jet Management': 'ejm.png',
+    'BellAir': 'bellair.png',
+    'NexGen Aviation': 'nexgenaviation.png',
+    'Flight Options': 'flightoptions.png',
+    'Worldwide Jet Charter': 'worldwidejetcharter.png',
+    # Add more mappings as needed
+}
+
+# Map callsign prefixes (first 3 characters) to logo filenames
+CALLSIGN_PREFIX_LOGOS = {
+    'LFG': 'letsjett.png',
+    'JNY': 'journeyaviation.png',
+    'JTL': 'jetlinxaviation.png',
+}
+
+class CarrierLogoService:
+    """Resolve carrier logos from an index built once from the images directory.
+
+    The carrier-name and callsign-prefix tables are merged into one lookup
+    index containing only logos that actually exist on disk, and every
+    (carrier, callsign prefix) answer is memoized, misses included, so
+    resolving a logo while rendering does no filesystem I/O. Call refresh()
+    from a background task to pick up added or removed logo files.
+    """
+
+    def __init__(self, images_dir):
+        self.images_dir = images_dir
+        self._lock = threading.Lock()
+        self._dir_mtime = None
+        self._index = {}
+        self._memo = {}
+        # Lookup statistics for metrics: every call, and calls that missed the memo
+        self.lookup_count = 0
+        self.slow_lookup_count = 0
+        self.refresh()
+        logger.info("Initialized CarrierLogoService with %d logo mappings from %s", len(self._index), images_dir)
+
+    def _build_index(self):
+        """Scan the images directory and build the merged lookup index."""
+        try:
+            files = {name for name in os.listdir(self.images_dir) if name.endswith('.png')}
+        except OSError as e:
+            logger.warning("Could not scan logo directory %s: %s", self.images_dir, e)
+            files = set()
+
+        index = {}
+        # Logos named after the carrier itself, e.g. "Wheels Up" -> wheelsup.png
+        for filename in files:
+            index[('carrier', filename[:-4])] = filename
+        # Explicit carrier mappings take precedence over derived names
+        for carrier, filename in CARRIER_LOGOS.items():
+            index[('carrier', carrier)] = filename if filename in files else None
+        for prefix, filename in CALLSIGN_PREFIX_LOGOS.items():
+            if filename in files:
+                index[('callsign', prefix)] = filename
+        return index
+
+    def refresh(self):
+        """Rebuild the index if the images directory changed. Returns True if it was rebuilt."""
+        try:
+            mtime = os.stat(self.images_dir).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime == self._dir_mtime and self._dir_mtime is not None:
+            return False
+        with self._lock:
+            index = self._build_index()
+            # Swap both at once so readers never combine a new index with an old memo
+            self._index, self._memo = index, {}
+            self._dir_mtime = mtime
+        return True
+
+    def _resolve(self, carrier, prefix):
+        self.slow_lookup_count += 1
+        index = self._index
+        if carrier:
+            key = ('carrier', carrier)
+            if key in index:
+                filename = index[key]
+            else:
+                filename = index.get(('carrier', carrier.lower().replace(' ', '')))
+            if filename:
+                return filename
+        if prefix:
+            filename = index.get(('callsign', prefix))
+            if filename:
+                return filename
+        logger.debug("No logo found for carrier: %s, callsign prefix: %s", carrier, prefix,
+                     extra={'rate_limited': True})
+        return ''
+
+    def get_logo(self, carrier, flight=None):
+        """Return the logo filename for a carrier/callsign, or an empty string."""
+        self.lookup_count += 1
+        prefix = flight[:3].upper() if isinstance(flight, str) and len(flight) >= 3 else None
+        key = (carrier or '', prefix)
+        memo = self._memo
+        filename = memo.get(key)
+        if filename is None:
+            filename = memo[key] = self._resolve(carrier, prefix)
+        return filename
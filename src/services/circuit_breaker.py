@@ -0,0 +1,67 @@
+import random
+import threading
+import time
+
+class CircuitBreaker:
+    """Stops calling a failing upstream until it has had time to recover.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    allow() returns False for ``reset_timeout`` seconds. Then a single trial
+    call is let through (half-open): success closes the circuit, failure
+    opens it again for another ``reset_timeout``.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=3, reset_timeout=300):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.consecutive_failures = 0
+        self._opened_at = None
+        self._trial_in_progress = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self):
+        """Return True if a call may be made now."""
+        with self._lock:
+            state = self.state
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_in_progress:
+                self._trial_in_progress = True
+                return True
+            return False
+
+    def retry_after(self):
+        """Seconds until the circuit lets a trial call through (0 if it already would)."""
+        if self._opened_at is None:
+            return 0
+        return max(0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def record_success(self):
+        with self._lock:
+            self.consecutive_failures = 0
+            self._opened_at = None
+            self._trial_in_progress = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            if self._trial_in_progress or self.consecutive_failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_in_progress = False
+
+def backoff_delay(base, failures, max_delay):
+    """Exponential backoff with equal jitter: base * 2^(failures-1), capped, randomized in [d/2, d]."""
+    delay = min(max_delay, base * 2 ** max(failures - 1, 0))
+    return delay / 2 + random.uniform(0, delay / 2)
@@ -0,0 +1,86 @@
+import heapq
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+class FetchScheduler:
+    """Drives periodic refreshes for many airports from one scheduler thread.
+
+    Initial fetches are staggered evenly across the refresh interval so
+    airports don't all hit the upstream API at once. Each refresh runs on a
+    small worker pool, and an airport is never refreshed twice at the same
+    time: requests for an airport that is already being fetched are dropped.
+    The next fetch is scheduled when the previous one finishes. ``refresh``
+    may return a number of seconds to override the default interval.
+    """
+
+    def __init__(self, refresh, interval=60, max_workers=4):
+        self.refresh = refresh
+        self.interval = interval
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='board-refresh')
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._heap = []
+        # Authoritative next due time per key; heap entries that disagree are stale
+        self._due = {}
+        self._intervals = {}
+        self._in_flight = set()
+        self._thread = None
+
+    def add(self, key, interval=None, delay=0):
+        with self._lock:
+            self._intervals[key] = interval or self.interval
+            self._schedule(key, time.monotonic() + delay)
+
+    def add_staggered(self, intervals):
+        """Add several keys ({key: interval}) with first fetches spread evenly over one interval."""
+        spacing = self.interval / max(len(intervals), 1)
+        for position, (key, interval) in enumerate(intervals.items()):
+            self.add(key, interval, delay=position * spacing)
+
+    def _schedule(self, key, due):
+        self._due[key] = due
+        heapq.heappush(self._heap, (due, key))
+        self._wakeup.set()
+
+    def _start(self, key):
+        if key in self._in_flight:
+            return False
+        self._in_flight.add(key)
+        self._due[key] = None
+        self._executor.submit(self._run, key)
+        return True
+
+    def _run(self, key):
+        delay = None
+        try:
+            delay = self.refresh(key)
+        except Exception:
+            logger.exception("Refresh for %s failed", key)
+        finally:
+            with self._lock:
+                self._in_flight.discard(key)
+                if not isinstance(delay, (int, float)):
+                    delay = self._intervals.get(key, self.interval)
+                self._schedule(key, time.monotonic() + delay)
+
+    def run_forever(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._heap and self._heap[0][0] <= now:
+                    due, key = heapq.heappop(self._heap)
+                    if self._due.get(key) == due:
+                        self._start(key)
+                timeout = self._heap[0][0] - now if self._heap else None
+                self._wakeup.clear()
+            self._wakeup.wait(timeout)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run_forever, name='fetch-scheduler', daemon=True)
+            self._thread.start()
+        return self._thread
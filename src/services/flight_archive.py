@@ -0,0 +1,168 @@
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from services.flight_records import DIRECTIONS
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS flights (
+    airport TEXT NOT NULL,
+    direction TEXT NOT NULL,
+    flight_id TEXT NOT NULL,
+    flight TEXT,
+    aircraft TEXT,
+    registration TEXT,
+    carrier TEXT,
+    other_airport_code TEXT,
+    other_airport_name TEXT,
+    scheduled_timestamp INTEGER,
+    estimated_timestamp INTEGER,
+    delay_status TEXT,
+    status TEXT,
+    status_class TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    PRIMARY KEY (airport, direction, flight_id)
+);
+CREATE INDEX IF NOT EXISTS flights_by_time ON flights (airport, scheduled_timestamp);
+CREATE INDEX IF NOT EXISTS flights_by_scheduled_time ON flights (scheduled_timestamp);
+CREATE INDEX IF NOT EXISTS flights_by_registration ON flights (registration, scheduled_timestamp);
+CREATE INDEX IF NOT EXISTS flights_by_carrier ON flights (carrier, scheduled_timestamp);
+"""
+
+# Later sightings of a flight refresh everything but first_seen
+UPSERT = """
+INSERT INTO flights (airport, direction, flight_id, flight, aircraft, registration, carrier,
+                     other_airport_code, other_airport_name, scheduled_timestamp, estimated_timestamp,
+                     delay_status, status, status_class, first_seen, last_seen)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (airport, direction, flight_id) DO UPDATE SET
+    flight = excluded.flight,
+    aircraft = excluded.aircraft,
+    registration = excluded.registration,
+    carrier = excluded.carrier,
+    other_airport_code = excluded.other_airport_code,
+    other_airport_name = excluded.other_airport_name,
+    scheduled_timestamp = excluded.scheduled_timestamp,
+    estimated_timestamp = excluded.estimated_timestamp,
+    delay_status = excluded.delay_status,
+    status = excluded.status,
+    status_class = excluded.status_class,
+    last_seen = excluded.last_seen
+"""
+
+# Columns returned by query(), in order
+QUERY_COLUMNS = (
+    'airport', 'direction', 'flight_id', 'flight', 'aircraft', 'registration', 'carrier',
+    'other_airport_code', 'other_airport_name', 'scheduled_timestamp', 'estimated_timestamp',
+    'delay_status', 'status', 'status_class', 'first_seen', 'last_seen',
+)
+
+MAX_QUERY_LIMIT = 1000
+
+def _archive_id(record):
+    """FlightRadar24 flight id; flights without one fall back to callsign + scheduled time."""
+    if record.id and record.id != record.flight:
+        return record.id
+    return f"{record.flight}@{record.scheduled_timestamp}"
+
+class FlightArchive:
+    """SQLite archive of every flight seen on the boards, one row per flight.
+
+    record() only queues a fetch cycle's records; a writer thread upserts
+    everything queued in one transaction, so the refresh path never waits on
+    disk. The database runs in WAL mode and each reader thread has its own
+    connection, so /api/history queries don't block the writer or each other.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_forever, name='flight-archive', daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def record(self, airport_code, flight_data, seen_at=None):
+        """Queue one fetch cycle's records ({direction: [FlightRecord]}) for archiving."""
+        seen_at = seen_at or time.time()
+        rows = [
+            (airport_code, direction, _archive_id(record), record.flight, record.aircraft, record.registration,
+             record.carrier, record.airport.code, record.airport.name, record.scheduled_timestamp or None,
+             record.estimated_timestamp, record.delay_status, record.status, record.status_class, seen_at, seen_at)
+            for direction, records in flight_data.items() for record in records
+        ]
+        if rows:
+            self._queue.put(rows)
+
+    def _write_forever(self):
+        conn = self._connect()
+        while True:
+            batches = [self._queue.get()]
+            # Fold everything else already waiting into the same transaction
+            while True:
+                try:
+                    batches.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with conn:
+                    for rows in batches:
+                        conn.executemany(UPSERT, rows)
+            except sqlite3.Error as e:
+                logger.error("Could not archive flights: %s", e)
+            finally:
+                for _ in batches:
+                    self._queue.task_done()
+
+    def flush(self):
+        """Block until every queued record has been written."""
+        self._queue.join()
+
+    def _reader(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def query(self, start, end, airport=None, direction=None, carrier=None, registration=None,
+              limit=100, after=None):
+        """Flights scheduled in [start, end), oldest first, at most ``limit`` of them.
+
+        ``after`` is the (scheduled_timestamp, rowid) cursor returned with the
+        previous page. Returns (rows as dicts, cursor for the next page or None).
+        """
+        if direction is not None and direction not in DIRECTIONS:
+            raise ValueError(f"Unknown direction: {direction}")
+        limit = max(1, min(limit, MAX_QUERY_LIMIT))
+        clauses = ['scheduled_timestamp >= ?', 'scheduled_timestamp < ?']
+        params = [start, end]
+        for column, value in (('airport', airport), ('direction', direction),
+                              ('carrier', carrier), ('registration', registration)):
+            if value is not None:
+                clauses.append(f'{column} = ?')
+                params.append(value)
+        if after is not None:
+            clauses.append('(scheduled_timestamp, rowid) > (?, ?)')
+            params.extend(after)
+        sql = (f"SELECT rowid, {', '.join(QUERY_COLUMNS)} FROM flights WHERE {' AND '.join(clauses)} "
+               f"ORDER BY scheduled_timestamp, rowid LIMIT ?")
+        rows = self._reader().execute(sql, params + [limit + 1]).fetchall()
+        cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            cursor = (rows[-1][QUERY_COLUMNS.index('scheduled_timestamp') + 1], rows[-1][0])
+        return [dict(zip(QUERY_COLUMNS, row[1:])) for row in rows], cursor
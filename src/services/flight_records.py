@@ -0,0 +1,126 @@
+from collections import namedtuple
+
+# Shared empty mapping used as the fallback for missing nested objects so we
+# never allocate a throwaway dict per missing field
+_EMPTY = {}
+
+Airport = namedtuple('Airport', ['code', 'name'])
+
+# Per-direction field table: which time key to read under scheduled/estimated/real
+# and which airport is the "other end" of the flight
+Direction = namedtuple('Direction', ['time_key', 'airport_key'])
+
+DIRECTIONS = {
+    'arrivals': Direction(time_key='arrival', airport_key='origin'),
+    'departures': Direction(time_key='departure', airport_key='destination'),
+}
+
+
+class FlightRecord:
+    """Normalized board row for a single arrival or departure."""
+
+    __slots__ = (
+        'id', 'direction', 'flight', 'aircraft', 'registration', 'carrier', 'airport',
+        'scheduled_time', 'scheduled_timestamp', 'estimated_time', 'estimated_timestamp',
+        'delay_status', 'status', 'status_class', 'is_special_status',
+    )
+
+    def __init__(self, id, direction, flight, aircraft, registration, carrier, airport,
+                 scheduled_time, scheduled_timestamp, estimated_time, estimated_timestamp,
+                 delay_status, status, status_class, is_special_status=False):
+        self.id = id
+        self.direction = direction
+        self.flight = flight
+        self.aircraft = aircraft
+        self.registration = registration
+        self.carrier = carrier
+        self.airport = airport
+        self.scheduled_time = scheduled_time
+        self.scheduled_timestamp = scheduled_timestamp
+        self.estimated_time = estimated_time
+        self.estimated_timestamp = estimated_timestamp
+        self.delay_status = delay_status
+        self.status = status
+        self.status_class = status_class
+        self.is_special_status = is_special_status
+
+    @property
+    def key(self):
+        """Stable identity of this row across board versions."""
+        return self.id or f"{self.flight}@{self.scheduled_timestamp}"
+
+    @property
+    def origin(self):
+        return self.airport if self.direction == 'arrivals' else None
+
+    @property
+    def destination(self):
+        return self.airport if self.direction == 'departures' else None
+
+    def to_dict(self):
+        """Return the record in the board's JSON/dict shape."""
+        data = {name: getattr(self, name) for name in self.__slots__ if name != 'airport'}
+        data[DIRECTIONS[self.direction].airport_key] = self.airport._asdict()
+        data['key'] = self.key
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a record from to_dict() output."""
+        airport = data[DIRECTIONS[data['direction']].airport_key]
+        fields = {name: data[name] for name in cls.__slots__ if name != 'airport'}
+        return cls(airport=Airport(**airport), **fields)
+
+    def __repr__(self):
+        return f"FlightRecord({self.direction}, {self.flight!r}, {self.scheduled_time!r}, {self.status!r})"
+
+
+def parse_flight(raw, direction, format_time):
+    """Normalize one raw FlightRadar24 schedule entry into a FlightRecord.
+
+    Every nested path is read exactly once and each timestamp is formatted at
+    most once with ``format_time`` (epoch seconds -> board time string).
+    Raises on malformed entries so callers can skip them.
+    """
+    fields = DIRECTIONS[direction]
+    time_key = fields.time_key
+
+    f = raw.get('flight') or _EMPTY
+    ident = f.get('identification') or _EMPTY
+    times = f.get('time') or _EMPTY
+    aircraft = f.get('aircraft') or _EMPTY
+    airport = (f.get('airport') or _EMPTY).get(fields.airport_key) or _EMPTY
+
+    scheduled_ts = (times.get('scheduled') or _EMPTY).get(time_key)
+    actual_ts = ((times.get('estimated') or _EMPTY).get(time_key)
+                 or (times.get('real') or _EMPTY).get(time_key))
+
+    delay_status = 'on-time'
+    if scheduled_ts and actual_ts:
+        delay_mins = (actual_ts - scheduled_ts) // 60
+        if delay_mins > 5:
+            delay_status = 'delayed'
+        elif delay_mins < -5:
+            delay_status = 'early'
+
+    airline = f.get('airline')
+
+    return FlightRecord(
+        id=ident.get('id', '') or ident.get('callsign', ''),
+        direction=direction,
+        flight=ident.get('callsign') or (ident.get('number') or _EMPTY).get('default', 'N/A'),
+        aircraft=(aircraft.get('model') or _EMPTY).get('code', 'N/A'),
+        registration=aircraft.get('registration', 'N/A'),
+        carrier=airline.get('name', '') if airline else '',
+        airport=Airport(
+            code=(airport.get('code') or _EMPTY).get('iata', 'N/A'),
+            name=airport.get('name', 'Unknown'),
+        ),
+        scheduled_time=format_time(scheduled_ts) if scheduled_ts else 'N/A',
+        scheduled_timestamp=scheduled_ts or 0,
+        estimated_time=format_time(actual_ts) if actual_ts else 'N/A',
+        estimated_timestamp=actual_ts or None,
+        delay_status=delay_status,
+        status=(f.get('status') or _EMPTY).get('text', 'N/A'),
+        status_class=delay_status,
+    )
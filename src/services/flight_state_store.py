@@ -0,0 +1,64 @@
+import heapq
+import threading
+import time
+
+# Default seconds a tracked flight is remembered after it was last seen in that state
+DEFAULT_TTLS = {
+    'cancelled': 1800,  # cancelled or diverted, 30 minutes
+    'landed': 600,      # 10 minutes
+}
+
+class FlightStateStore:
+    """Remembers which flights were cancelled/diverted or landed, each for its kind's TTL.
+
+    Entries are {flight_id: {'timestamp': ..., **info}} per kind. Expiry times
+    go on a heap so expire() only touches entries that are due instead of
+    scanning every tracked flight. Marking a flight again pushes a new heap
+    entry; the older one is recognized as stale when it is popped.
+    """
+
+    def __init__(self, ttls=None):
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self._entries = {kind: {} for kind in self.ttls}
+        self._heap = []
+        self._lock = threading.Lock()
+
+    def mark(self, kind, flight_id, **info):
+        """Record that a flight is in state ``kind`` as of now."""
+        self._set(kind, flight_id, dict(info, timestamp=time.time()))
+
+    def _set(self, kind, flight_id, entry):
+        with self._lock:
+            self._entries[kind][flight_id] = entry
+            heapq.heappush(self._heap, (entry['timestamp'] + self.ttls[kind], kind, flight_id))
+
+    def get(self, kind, flight_id):
+        """Return the tracked entry for a flight, or None."""
+        return self._entries[kind].get(flight_id)
+
+    def expire(self, now=None):
+        """Forget entries whose TTL has passed."""
+        now = now or time.time()
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                expires_at, kind, flight_id = heapq.heappop(self._heap)
+                entry = self._entries[kind].get(flight_id)
+                if entry is not None and entry['timestamp'] + self.ttls[kind] <= now:
+                    del self._entries[kind][flight_id]
+
+    def counts(self):
+        return {kind: len(entries) for kind, entries in self._entries.items()}
+
+    def export(self):
+        """Copy of the tracked entries, for snapshots."""
+        with self._lock:
+            return {kind: dict(entries) for kind, entries in self._entries.items()}
+
+    def restore(self, state):
+        """Reload entries saved by export(), keeping their original timestamps."""
+        for kind, entries in state.items():
+            if kind not in self._entries:
+                continue
+            for flight_id, entry in entries.items():
+                self._set(kind, flight_id, entry)
+        self.expire()
@@ -0,0 +1,209 @@
+"""Record and replay FlightRadar24 schedule responses.
+
+Capture mode stores every raw schedule response as gzipped JSON. Replay
+mode serves those captures back, either through ReplayAdapter (a requests
+transport mounted on the fetcher's session) or through a local stub HTTP
+server, with configurable latency and page size:
+
+    python -m services.fr24_replay serve --dir captures --port 8024 --latency-ms 150
+
+then point "api_url" in config.json at http://localhost:8024/common/v1/airport.json.
+"""
+import argparse
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests # type: ignore
+from requests.adapters import BaseAdapter # type: ignore
+from requests.structures import CaseInsensitiveDict # type: ignore
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_SUFFIX = '.json.gz'
+
+def capture_response(capture_dir, airport_code, mode, page, body):
+    """Write one raw schedule response body (bytes) to the capture directory."""
+    os.makedirs(capture_dir, exist_ok=True)
+    filename = f"{airport_code.upper()}_{mode}_{time.time_ns()}_p{page}{CAPTURE_SUFFIX}"
+    path = os.path.join(capture_dir, filename)
+    tmp_path = path + '.tmp'
+    with gzip.open(tmp_path, 'wb') as capture_file:
+        capture_file.write(body)
+    os.replace(tmp_path, path)
+    return path
+
+def _load_capture(path):
+    with gzip.open(path, 'rb') as capture_file:
+        return json.loads(capture_file.read())
+
+def _schedule_block(payload, mode):
+    return payload.get('result', {}).get('response', {}).get('airport', {}).get('pluginData', {}).get('schedule', {}).get(mode)
+
+class CaptureStore:
+    """Captured responses indexed by (airport, mode, page), replayed in capture order and looped.
+
+    A page 1 request moves an airport/mode on to its next captured cycle and
+    requests for later pages are answered from that same cycle, so paging
+    through a replayed board returns the pages that were captured together.
+    """
+
+    def __init__(self, capture_dir):
+        self.capture_dir = capture_dir
+        self._lock = threading.Lock()
+        # (airport, mode) -> {page: [capture paths in capture order]}
+        self._captures = {}
+        self._positions = {}
+        for filename in sorted(os.listdir(capture_dir)):
+            if not filename.endswith(CAPTURE_SUFFIX):
+                continue
+            parts = filename[:-len(CAPTURE_SUFFIX)].split('_')
+            if len(parts) != 4 or not parts[3].startswith('p') or not parts[3][1:].isdigit():
+                continue
+            airport_code, mode, page = parts[0], parts[1], int(parts[3][1:])
+            pages = self._captures.setdefault((airport_code, mode), {})
+            pages.setdefault(page, []).append(os.path.join(capture_dir, filename))
+
+    def __len__(self):
+        return sum(len(paths) for pages in self._captures.values() for paths in pages.values())
+
+    def _position(self, key, page):
+        with self._lock:
+            position = self._positions.get(key, -1)
+            if page == 1 or position < 0:
+                position += 1
+                self._positions[key] = position
+        return position
+
+    def page_payload(self, airport_code, mode, page):
+        """Return the captured payload for one page of the current cycle, or None if there is none."""
+        key = (airport_code.upper(), mode)
+        paths = self._captures.get(key, {}).get(page)
+        if not paths:
+            return None
+        return _load_capture(paths[self._position(key, page) % len(paths)])
+
+    def cycle_payload(self, airport_code, mode, page):
+        """Return the current cycle's first page with the flights of every captured page, or None."""
+        key = (airport_code.upper(), mode)
+        pages = self._captures.get(key)
+        if not pages:
+            return None
+        position = self._position(key, page)
+        payload = None
+        flights = []
+        for _, paths in sorted(pages.items()):
+            page_payload = _load_capture(paths[position % len(paths)])
+            payload = payload or page_payload
+            schedule = _schedule_block(page_payload, mode)
+            if schedule is not None:
+                flights.extend(schedule.get('data') or [])
+        schedule = _schedule_block(payload, mode)
+        if schedule is not None:
+            schedule['data'] = flights
+        return payload
+
+    def render(self, params, page_size=None):
+        """Build (status, body bytes) for an airport.json request from its query params.
+
+        Captured pages are served as they were recorded; with ``page_size`` the
+        cycle's flights are re-sliced into pages of that size instead.
+        """
+        airport_code = params.get('code', '')
+        mode = params.get('plugin-setting[schedule][mode]', 'arrivals')
+        page = int(params.get('page', 1))
+        if page_size:
+            payload = self.cycle_payload(airport_code, mode, page)
+        else:
+            payload = self.page_payload(airport_code, mode, page)
+        if payload is None:
+            return 404, json.dumps({'errors': {'message': f'No capture for {airport_code} {mode} page {page}'}}).encode()
+        schedule = _schedule_block(payload, mode)
+        if page_size and schedule is not None:
+            paginate(schedule, page, page_size)
+        return 200, json.dumps(payload).encode()
+
+def paginate(schedule, page, limit):
+    """Slice a schedule block's data in place to one page, updating its page/item metadata."""
+    data = schedule.get('data', [])
+    total = len(data)
+    limit = max(limit, 1)
+    schedule['data'] = data[(page - 1) * limit:page * limit]
+    schedule['item'] = {'current': len(schedule['data']), 'total': total, 'limit': limit}
+    schedule['page'] = {'current': page, 'total': max(1, -(-total // limit))}
+
+class ReplayAdapter(BaseAdapter):
+    """requests transport that answers from a CaptureStore instead of the network."""
+
+    def __init__(self, store, latency_ms=0, page_size=None):
+        super().__init__()
+        self.store = store
+        self.latency = latency_ms / 1000.0
+        self.page_size = page_size
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if self.latency:
+            time.sleep(self.latency)
+        params = {key: values[-1] for key, values in parse_qs(urlparse(request.url).query).items()}
+        status, body = self.store.render(params, self.page_size)
+        response = requests.Response()
+        response.status_code = status
+        response._content = body
+        response.encoding = 'utf-8'
+        response.headers = CaseInsensitiveDict({'Content-Type': 'application/json'})
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+def replay_adapter_from_config(replay_config):
+    """Build a ReplayAdapter from the "fr24_replay" config block."""
+    store = CaptureStore(replay_config['dir'])
+    logger.info("Replaying %d captured FlightRadar24 responses from %s", len(store), replay_config['dir'])
+    return ReplayAdapter(store, replay_config.get('latency_ms', 0), replay_config.get('page_size'))
+
+def serve(capture_dir, host='127.0.0.1', port=8024, latency_ms=0, page_size=None):
+    """Run a local stand-in for the airport.json endpoint backed by captures."""
+    store = CaptureStore(capture_dir)
+
+    class ReplayHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if latency_ms:
+                time.sleep(latency_ms / 1000.0)
+            params = {key: values[-1] for key, values in parse_qs(urlparse(self.path).query).items()}
+            status, body = store.render(params, page_size)
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), ReplayHandler)
+    print(f"Serving {len(store)} captured responses from {capture_dir} on http://{host}:{port}/common/v1/airport.json")
+    server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay captured FlightRadar24 schedule responses.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    serve_parser = subparsers.add_parser('serve', help='run a local stub server')
+    serve_parser.add_argument('--dir', required=True, help='capture directory')
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8024)
+    serve_parser.add_argument('--latency-ms', type=int, default=0)
+    serve_parser.add_argument('--page-size', type=int, default=None)
+    args = parser.parse_args()
+    if args.command == 'serve':
+        serve(args.dir, args.host, args.port, args.latency_ms, args.page_size)
+
+if __name__ == '__main__':
+    main()
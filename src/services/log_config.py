@@ -0,0 +1,103 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+
+DEFAULT_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+# Seconds an identical message is held back after it was last logged
+DEFAULT_REPEAT_INTERVAL = 300
+
+# Distinct messages remembered by RepeatFilter before expired ones are pruned
+MAX_TRACKED_MESSAGES = 10000
+
+_listener = None
+
+class RepeatFilter(logging.Filter):
+    """Logs each distinct opted-in message at most once per ``interval`` seconds.
+
+    Only records logged with ``extra={'rate_limited': True}`` are limited,
+    and never warnings, errors or records carrying a traceback. Messages are
+    told apart by logger, level and formatted text. Repeats in between are
+    only counted, and the count is appended to the next copy that gets
+    through, so a miss logged for every row of every render shows up once
+    per interval instead of flooding the log.
+    """
+
+    def __init__(self, interval=DEFAULT_REPEAT_INTERVAL):
+        super().__init__()
+        self.interval = interval
+        self._lock = threading.Lock()
+        # (logger, level, message) -> [time it may be logged again, repeats held back]
+        self._seen = {}
+
+    def filter(self, record):
+        if (self.interval <= 0 or not getattr(record, 'rate_limited', False)
+                or record.levelno >= logging.WARNING or record.exc_info):
+            return True
+        message = record.getMessage()
+        key = (record.name, record.levelno, message)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._seen.get(key)
+            if entry is not None and now < entry[0]:
+                entry[1] += 1
+                return False
+            suppressed = entry[1] if entry is not None else 0
+            if len(self._seen) >= MAX_TRACKED_MESSAGES:
+                self._seen = {k: v for k, v in self._seen.items() if now < v[0]}
+            self._seen[key] = [now + self.interval, 0]
+        if suppressed:
+            record.msg = f"{message} ({suppressed} repeats suppressed)"
+            record.args = None
+        return True
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, for log collectors."""
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+def configure_logging(settings=None):
+    """Route all logging through an in-process queue to one writer thread.
+
+    Callers only format the record and put it on the queue, so request and
+    fetch threads never wait on stdout. ``settings`` is the "logging" config
+    block: "level" (default INFO), "format" ("text" or "json"),
+    "repeat_interval" (seconds, 0 logs every repeat) and "levels", a
+    {logger name: level} map. Only the first call has any effect.
+    """
+    global _listener
+    if _listener is not None:
+        return
+    settings = settings or {}
+
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonFormatter() if settings.get('format') == 'json' else logging.Formatter(DEFAULT_FORMAT))
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(RepeatFilter(settings.get('repeat_interval', DEFAULT_REPEAT_INTERVAL)))
+
+    root = logging.getLogger()
+    root.setLevel(str(settings.get('level', 'INFO')).upper())
+    root.addHandler(queue_handler)
+    for name, level in settings.get('levels', {}).items():
+        logging.getLogger(name).setLevel(str(level).upper())
+
+    _listener = logging.handlers.QueueListener(log_queue, handler)
+    _listener.start()
+    # Write out whatever is still queued when the process exits
+    atexit.register(_listener.stop)
@@ -0,0 +1,107 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+class AdaptivePollingPolicy:
+    """Picks the delay before an airport's next fetch from what is on its board.
+
+    - A flight due within ``imminent_window`` seconds: poll at ``min_interval``.
+    - The last fetch changed the board: poll at the normal refresh interval.
+    - Otherwise the board is quiet and each unchanged fetch stretches the
+      interval by ``backoff_factor``, up to ``max_interval``. With nothing due
+      in the next ``busy_window`` seconds, or during ``quiet_hours`` (local
+      time), it goes straight to ``max_interval``.
+
+    With a ``daily_call_budget`` the delay is then stretched, if needed, so the
+    calls left for the day last until local midnight.
+    """
+
+    def __init__(self, refresh_interval=60, tz=None, min_interval=None, max_interval=600,
+                 imminent_window=600, busy_window=3600, backoff_factor=1.5,
+                 quiet_hours=None, daily_call_budget=None):
+        self.refresh_interval = refresh_interval
+        # pytz timezone the board's day and quiet hours are in
+        self.tz = tz
+        # Polling faster than refresh_interval near due flights is opt-in
+        self.min_interval = refresh_interval if min_interval is None else min(min_interval, refresh_interval)
+        self.max_interval = max(max_interval, refresh_interval)
+        self.imminent_window = imminent_window
+        self.busy_window = busy_window
+        self.backoff_factor = backoff_factor
+        self.quiet_hours = quiet_hours
+        self.daily_call_budget = daily_call_budget
+        # Delay chosen for the next fetch, before any stretching for the budget
+        self.interval = refresh_interval
+        self.calls_today = 0
+        self._calls_per_fetch = 1
+        self._day = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, airport_config, tz):
+        """Build the policy from an airport config's ``adaptive_polling`` block (or None if disabled)."""
+        settings = airport_config.get('adaptive_polling', {})
+        if settings is False or (isinstance(settings, dict) and not settings.get('enabled', True)):
+            return None
+        settings = {key: value for key, value in settings.items() if key != 'enabled'}
+        return cls(refresh_interval=airport_config.get('refresh_interval', 60), tz=tz, **settings)
+
+    def _local_now(self, now):
+        return datetime.fromtimestamp(now, self.tz)
+
+    def _roll_day(self, now):
+        day = self._local_now(now).date()
+        if day != self._day:
+            self._day = day
+            self.calls_today = 0
+
+    def record_calls(self, calls, now=None):
+        """Count the upstream API calls made by one fetch against today's budget."""
+        now = now or time.time()
+        with self._lock:
+            self._roll_day(now)
+            self.calls_today += calls
+            self._calls_per_fetch = max(calls, 1)
+
+    def in_quiet_hours(self, now=None):
+        if not self.quiet_hours:
+            return False
+        hour = self._local_now(now or time.time()).hour
+        start, end = self.quiet_hours['start'], self.quiet_hours['end']
+        if start <= end:
+            return start <= hour < end
+        return hour >= start or hour < end
+
+    def budget_delay(self, now=None):
+        """Shortest delay that keeps the remaining calls within today's budget (0 without a budget)."""
+        if not self.daily_call_budget:
+            return 0
+        now = now or time.time()
+        with self._lock:
+            self._roll_day(now)
+            local_now = self._local_now(now)
+            midnight = self.tz.localize(datetime.combine(local_now.date() + timedelta(days=1), datetime.min.time()))
+            seconds_left = max((midnight - local_now).total_seconds(), 1)
+            fetches_left = (self.daily_call_budget - self.calls_today) // self._calls_per_fetch
+        if fetches_left <= 0:
+            # Budget spent: wait for tomorrow's
+            return seconds_left
+        return seconds_left / fetches_left
+
+    def next_interval(self, records, changed, now=None):
+        """Return the delay before the next fetch given the board's records and whether it just changed."""
+        now = now or time.time()
+        upcoming = [
+            record.estimated_timestamp or record.scheduled_timestamp
+            for record in records if not record.is_special_status
+        ]
+        if any(abs(due - now) <= self.imminent_window for due in upcoming if due):
+            interval = self.min_interval
+        elif changed:
+            interval = self.refresh_interval
+        elif self.in_quiet_hours(now) or not any(0 <= due - now <= self.busy_window for due in upcoming if due):
+            interval = self.max_interval
+        else:
+            interval = min(self.max_interval, max(self.interval, self.refresh_interval) * self.backoff_factor)
+        self.interval = interval
+        return max(interval, self.budget_delay(now))
@@ -0,0 +1,106 @@
+import hashlib
+import io
+import logging
+import os
+from functools import lru_cache
+
+try:
+    from PIL import Image, ImageDraw, ImageFont # type: ignore
+except ImportError:
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# Standard Open Graph image size
+PREVIEW_SIZE = (1200, 630)
+
+# Rendered previews kept on disk; older ones are removed
+MAX_CACHED_FILES = 50
+
+DEFAULT_FONTS = ('DejaVuSans.ttf', 'Arial.ttf')
+
+@lru_cache(maxsize=16)
+def _load_font(font_path, size):
+    for candidate in ((font_path,) if font_path else ()) + DEFAULT_FONTS:
+        try:
+            return ImageFont.truetype(candidate, size)
+        except IOError:
+            continue
+    return ImageFont.load_default()
+
+@lru_cache(maxsize=4)
+def _load_logo(logo_path, mtime, size):
+    logo = Image.open(logo_path)
+    logo.load()
+    return logo.resize((size, size))
+
+class PreviewRenderer:
+    """Renders a board's Open Graph image and keeps a copy on disk.
+
+    Images are keyed by a hash of everything drawn on them, so a restart (or
+    a new board version with the same counts) reuses the file on disk
+    instead of drawing it again. Needs Pillow; available is False without it.
+    """
+
+    def __init__(self, cache_dir, logo_path=None, font_path=None):
+        self.cache_dir = cache_dir
+        self.logo_path = logo_path
+        self.font_path = font_path
+
+    @property
+    def available(self):
+        return Image is not None
+
+    def render(self, lines):
+        """Return PNG bytes for [(text, size, rgb color), ...] drawn top to bottom."""
+        logo_mtime = os.path.getmtime(self.logo_path) if self.logo_path and os.path.exists(self.logo_path) else None
+        key = hashlib.sha256(repr((lines, self.logo_path, logo_mtime, self.font_path)).encode()).hexdigest()[:32]
+        path = os.path.join(self.cache_dir, f'{key}.png')
+        try:
+            with open(path, 'rb') as preview_file:
+                return preview_file.read()
+        except OSError:
+            pass
+
+        body = self._draw(lines, logo_mtime)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as preview_file:
+                preview_file.write(body)
+            os.replace(tmp_path, path)
+            self._prune()
+        except OSError as e:
+            logger.warning("Could not cache preview image: %s", e)
+        return body
+
+    def _draw(self, lines, logo_mtime):
+        width, height = PREVIEW_SIZE
+        img = Image.new('RGB', (width, height), color=(26, 26, 26))
+        draw = ImageDraw.Draw(img)
+        y = 180
+        for text, size, color in lines:
+            draw.text((60, y), text, fill=color, font=_load_font(self.font_path, size))
+            y += int(size * 1.6)
+
+        if logo_mtime is not None:
+            try:
+                logo = _load_logo(self.logo_path, logo_mtime, 200)
+                img.paste(logo, (width - 280, 60), logo if logo.mode == 'RGBA' else None)
+            except Exception as e:
+                logger.warning("Could not add logo to preview: %s", e)
+
+        img_io = io.BytesIO()
+        img.save(img_io, 'PNG')
+        return img_io.getvalue()
+
+    def _prune(self):
+        files = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir) if name.endswith('.png')]
+        if len(files) <= MAX_CACHED_FILES:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[:-MAX_CACHED_FILES]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
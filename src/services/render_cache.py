@@ -0,0 +1,58 @@
+import gzip
+import hashlib
+import threading
+
+try:
+    import brotli # type: ignore
+except ImportError:
+    brotli = None
+
+class RenderedPage:
+    """A rendered page body with its content hash and precompressed variants."""
+
+    __slots__ = ('key', 'body', 'etag', 'encodings', 'mimetype')
+
+    def __init__(self, key, content, mimetype='text/html', compress=True):
+        self.key = key
+        self.body = content if isinstance(content, bytes) else content.encode('utf-8')
+        self.etag = hashlib.sha256(self.body).hexdigest()[:32]
+        self.mimetype = mimetype
+        self.encodings = {}
+        # Compress once here so serving is a plain bytes write (not for already-compressed formats)
+        if compress:
+            self.encodings['gzip'] = gzip.compress(self.body, compresslevel=6)
+            if brotli is not None:
+                self.encodings['br'] = brotli.compress(self.body, quality=9)
+
+    def variant(self, accept_encodings):
+        """Return (content_encoding, body) for the best encoding the client accepts."""
+        for encoding in ('br', 'gzip'):
+            if encoding in self.encodings and accept_encodings[encoding]:
+                return encoding, self.encodings[encoding]
+        return None, self.body
+
+class RenderCache:
+    """Holds the most recently rendered page and re-renders only when its key changes.
+
+    The key is whatever identifies the data behind the page (e.g. the board
+    version and last-update stamp). Concurrent requests for a new key wait for
+    a single render instead of each rendering the template themselves.
+    """
+
+    def __init__(self):
+        self._page = None
+        self._lock = threading.Lock()
+
+    def get(self, key, render, mimetype='text/html', compress=True):
+        page = self._page
+        if page is not None and page.key == key:
+            return page
+        with self._lock:
+            page = self._page
+            if page is None or page.key != key:
+                page = RenderedPage(key, render(), mimetype, compress)
+                self._page = page
+            return page
+
+    def clear(self):
+        self._page = None
@@ -0,0 +1,75 @@
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Bumped when the snapshot layout changes; snapshots in another format are ignored
+SNAPSHOT_FORMAT = 2
+
+class SnapshotStore:
+    """Persists the boards, with their flight tracking state, to one JSON file for warm restarts.
+
+    Each save writes a temporary file, fsyncs it and swaps it in with
+    os.replace, so a crash mid-write leaves the previous snapshot intact.
+    Snapshots carry a ``writer`` id unique to this store instance, so a
+    process following the file can tell a restarted writer from an old save.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.writer = f'{os.getpid()}-{time.time_ns()}'
+        self._lock = threading.Lock()
+        self._seen = None
+
+    def save(self, collect_boards):
+        """Write the {code: board snapshot} returned by ``collect_boards()``.
+
+        The boards are collected, serialized and written under one lock, so
+        concurrent saves land in the order their boards were read and the
+        file never goes back to an older version.
+        """
+        with self._lock:
+            snapshot = {
+                'format': SNAPSHOT_FORMAT,
+                'writer': self.writer,
+                'saved_at': time.time(),
+                'boards': collect_boards(),
+            }
+            body = json.dumps(snapshot, separators=(',', ':'))
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w') as snapshot_file:
+                snapshot_file.write(body)
+                snapshot_file.flush()
+                os.fsync(snapshot_file.fileno())
+            os.replace(tmp_path, self.path)
+
+    def changed(self):
+        """Whether the file has been replaced since the last call (cheap enough to poll)."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+        signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if signature == self._seen:
+            return False
+        self._seen = signature
+        return True
+
+    def load(self):
+        """Return the saved snapshot, or None if there is none or it can't be used."""
+        try:
+            with open(self.path) as snapshot_file:
+                snapshot = json.load(snapshot_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Could not read board snapshot %s: %s", self.path, e)
+            return None
+        if snapshot.get('format') != SNAPSHOT_FORMAT:
+            logger.warning("Ignoring board snapshot %s in an unknown format", self.path)
+            return None
+        return snapshot
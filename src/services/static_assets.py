@@ -0,0 +1,148 @@
+import hashlib
+import os
+import tempfile
+import threading
+
+from werkzeug.utils import safe_join # type: ignore
+
+try:
+    from PIL import Image # type: ignore
+except ImportError:
+    Image = None
+
+# Hashed asset URLs never change content, so browsers may keep them for a year
+ASSET_MAX_AGE = 365 * 24 * 3600
+
+HASH_LENGTH = 12
+
+def _signature(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+def _split_hashed(name):
+    """'css/styles.<hash>.css' -> ('css/styles.css', '<hash>'), or None if it isn't a hashed name."""
+    directory, _, base = name.rpartition('/')
+    parts = base.rsplit('.', 2)
+    if len(parts) != 3:
+        return None
+    stem, digest, ext = parts
+    return (f'{directory}/' if directory else '') + f'{stem}.{ext}', digest
+
+class StaticAssets:
+    """Content-hashed URLs for files under static/, served with immutable caching.
+
+    url('css/styles.css') returns '/assets/css/styles.<hash>.css', so a
+    screen fetches each file once and only again after it changes. Carrier
+    logos get their own variants under '/assets/logos/', downscaled to
+    ``logo_height`` pixels (twice the 20px they are shown at) and stored in
+    ``cache_dir``. Every hashed name can be resolved from the name alone, so
+    any worker process can serve a URL another one rendered. Without Pillow
+    logos are served at their original size.
+
+    Hashes are memoized per file; refresh() re-checks the files seen so far
+    and drops the ones that changed.
+    """
+
+    def __init__(self, static_dir, cache_dir, logo_height=40):
+        self.static_dir = static_dir
+        self.cache_dir = cache_dir
+        self.logo_height = logo_height
+        self._lock = threading.Lock()
+        # filename -> (signature, content hash)
+        self._hashes = {}
+
+    def _hash(self, filename):
+        entry = self._hashes.get(filename)
+        if entry is None:
+            path = safe_join(self.static_dir, filename)
+            signature = _signature(path)
+            with open(path, 'rb') as asset_file:
+                digest = hashlib.sha256(asset_file.read()).hexdigest()[:HASH_LENGTH]
+            entry = self._hashes[filename] = (signature, digest)
+        return entry[1]
+
+    def _logo_hash(self, logo):
+        key = f'{self._hash(f"images/{logo}")}:{self.logo_height}'
+        return hashlib.sha256(key.encode()).hexdigest()[:HASH_LENGTH]
+
+    def url(self, filename):
+        """Hashed URL for a file under static/, or its plain /static/ URL if it can't be read."""
+        try:
+            digest = self._hash(filename)
+        except (OSError, TypeError):
+            return f'/static/{filename}'
+        stem, ext = os.path.splitext(filename)
+        return f'/assets/{stem}.{digest}{ext}'
+
+    def logo_url(self, logo):
+        """URL of the downscaled variant of a carrier logo in static/images/ ('' for no logo)."""
+        if not logo:
+            return ''
+        if Image is None:
+            return self.url(f'images/{logo}')
+        try:
+            digest = self._logo_hash(logo)
+        except (OSError, TypeError):
+            return f'/static/images/{logo}'
+        stem, ext = os.path.splitext(logo)
+        return f'/assets/logos/{stem}.{digest}{ext}'
+
+    def resolve(self, name):
+        """File to serve for a hashed asset name, or None if it doesn't match current content."""
+        split = _split_hashed(name)
+        if split is None:
+            return None
+        filename, digest = split
+        try:
+            if filename.startswith('logos/') and Image is not None:
+                logo = filename[len('logos/'):]
+                if '/' in logo or digest != self._logo_hash(logo):
+                    return None
+                try:
+                    return self._logo_variant(logo, digest)
+                except OSError:
+                    # Can't write the variant (full disk, permissions): the original still displays
+                    return safe_join(self.static_dir, 'images', logo)
+            if digest != self._hash(filename):
+                return None
+        except (OSError, TypeError):
+            return None
+        return safe_join(self.static_dir, filename)
+
+    def _logo_variant(self, logo, digest):
+        stem, ext = os.path.splitext(logo)
+        path = os.path.join(self.cache_dir, 'logos', f'{stem}.{digest}{ext}')
+        if os.path.exists(path):
+            return path
+        with self._lock:
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # Other worker processes may be building the same variant: each writes its
+                # own temp file, and whichever replace lands last wins with identical bytes
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+                try:
+                    with os.fdopen(fd, 'wb') as tmp_file, \
+                            Image.open(os.path.join(self.static_dir, 'images', logo)) as image:
+                        image = image.convert('RGBA')
+                        if image.height > self.logo_height:
+                            width = max(1, round(image.width * self.logo_height / image.height))
+                            image = image.resize((width, self.logo_height), Image.LANCZOS)
+                        image.save(tmp_file, 'PNG', optimize=True)
+                    os.replace(tmp_path, path)
+                except OSError:
+                    try:
+                        os.remove(tmp_path)
+                    except OSError:
+                        pass
+                    raise
+        return path
+
+    def refresh(self):
+        """Forget the hashes of files that changed or disappeared since they were read."""
+        for filename, (signature, _) in list(self._hashes.items()):
+            try:
+                changed = _signature(safe_join(self.static_dir, filename)) != signature
+            except (OSError, TypeError):
+                changed = True
+            if changed:
+                self._hashes.pop(filename, None)
@@ -0,0 +1,51 @@
+import threading
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+import pytz # type: ignore
+
+DEFAULT_TIMEZONE = 'America/New_York'
+
+# Board time format: 12-hour clock without leading zeros, e.g. "9:05 AM"
+TIME_FORMAT = '%-I:%M %p'
+
+class TimeFormatService:
+    """Format epoch timestamps as local board times with a minute-bucketed LRU cache.
+
+    The board only shows hours and minutes, so every timestamp inside the same
+    UTC minute formats identically. Buckets are keyed on the absolute epoch
+    minute rather than on local wall-clock time, which keeps results correct
+    across DST transitions (the repeated 1 AM hour maps to distinct buckets).
+    """
+
+    def __init__(self, tz_name=DEFAULT_TIMEZONE, cache_size=4096):
+        self.tz_name = tz_name
+        self.tz = pytz.timezone(tz_name)
+        self._format_minute = lru_cache(maxsize=cache_size)(self._format_minute_uncached)
+
+    def _format_minute_uncached(self, minute):
+        local_time = datetime.fromtimestamp(minute * 60, timezone.utc).astimezone(self.tz)
+        return local_time.strftime(TIME_FORMAT)
+
+    def format_timestamp(self, timestamp):
+        """Format an epoch timestamp (seconds) as local board time."""
+        return self._format_minute(int(timestamp) // 60)
+
+    def now(self):
+        """Format the current time as local board time."""
+        return self.format_timestamp(time.time())
+
+    def cache_info(self):
+        return self._format_minute.cache_info()
+
+_services = {}
+_services_lock = threading.Lock()
+
+def get_time_format_service(tz_name=None):
+    """Return the shared TimeFormatService for a timezone, creating it on first use."""
+    tz_name = tz_name or DEFAULT_TIMEZONE
+    service = _services.get(tz_name)
+    if service is None:
+        with _services_lock:
+            service = _services.setdefault(tz_name, TimeFormatService(tz_name))
+    return service
@@ -0,0 +1,121 @@
+import logging
+import threading
+import time
+
+import requests # type: ignore
+
+from services.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+OPEN_METEO_URL = "https://api.open-meteo.com/v1/forecast"
+
+# Open-Meteo weather codes -> (description, icon under static/images/weather/)
+WEATHER_CODES = {
+    0: ("Clear", "wi-day-sunny"),
+    1: ("Mainly Clear", "wi-day-sunny-overcast"),
+    2: ("Partly Cloudy", "wi-day-cloudy"),
+    3: ("Overcast", "wi-cloudy"),
+    45: ("Fog", "wi-fog"),
+    48: ("Depositing Rime Fog", "wi-fog"),
+    51: ("Light Drizzle", "wi-sprinkle"),
+    53: ("Drizzle", "wi-sprinkle"),
+    55: ("Dense Drizzle", "wi-sprinkle"),
+    56: ("Freezing Drizzle", "wi-rain-mix"),
+    57: ("Freezing Drizzle", "wi-rain-mix"),
+    61: ("Light Rain", "wi-raindrops"),
+    63: ("Rain", "wi-rain"),
+    65: ("Heavy Rain", "wi-rain"),
+    66: ("Freezing Rain", "wi-rain-mix"),
+    67: ("Freezing Rain", "wi-rain-mix"),
+    71: ("Light Snow", "wi-snow"),
+    73: ("Snow", "wi-snow"),
+    75: ("Heavy Snow", "wi-snow"),
+    77: ("Snow Grains", "wi-snow"),
+    80: ("Showers", "wi-showers"),
+    81: ("Rain Showers", "wi-showers"),
+    82: ("Violent Showers", "wi-showers"),
+    85: ("Snow Showers", "wi-snow"),
+    86: ("Heavy Snow Showers", "wi-snow"),
+    95: ("Thunderstorm", "wi-thunderstorm"),
+    96: ("Thunderstorm + Hail", "wi-thunderstorm"),
+    99: ("Thunderstorm + Hail", "wi-thunderstorm"),
+}
+
+WEATHER_FETCHES = REGISTRY.counter(
+    'weather_fetches_total', 'Open-Meteo requests made for the weather widget by result', ('airport', 'result'))
+
+class WeatherService:
+    """Current weather for one airport, fetched from Open-Meteo at most once per TTL.
+
+    However many screens ask, only one request is in flight at a time: the
+    first caller after the TTL refreshes while the others keep getting the
+    previous reading (or wait for it, if there is none yet). Failed refreshes
+    keep serving the previous reading for up to ``max_age`` seconds and are
+    retried after ``retry_interval``.
+    """
+
+    def __init__(self, airport_code, coordinates, ttl=600, max_age=3600, retry_interval=60,
+                 temperature_unit='fahrenheit', api_url=OPEN_METEO_URL, timeout=10):
+        self.airport_code = airport_code
+        self.coordinates = coordinates or {}
+        self.ttl = ttl
+        self.max_age = max_age
+        self.retry_interval = retry_interval
+        self.temperature_unit = temperature_unit
+        self.api_url = api_url
+        self.timeout = timeout
+        self._session = requests.Session()
+        self._lock = threading.Lock()
+        self._current = None
+        self._fetched_at = 0
+        self._next_fetch = 0
+
+    def _fetch(self):
+        params = {
+            'latitude': self.coordinates['latitude'],
+            'longitude': self.coordinates['longitude'],
+            'current_weather': 'true',
+            'temperature_unit': self.temperature_unit,
+        }
+        response = self._session.get(self.api_url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        current = response.json()['current_weather']
+        code = current.get('weathercode')
+        description, icon = WEATHER_CODES.get(code, ("Unknown", None))
+        return {
+            'temperature': round(current['temperature']),
+            'unit': 'C' if self.temperature_unit == 'celsius' else 'F',
+            'code': code,
+            'description': description,
+            'icon': icon,
+        }
+
+    def _refresh(self):
+        now = time.time()
+        if now < self._next_fetch:
+            return
+        try:
+            self._current = self._fetch()
+            self._fetched_at = now
+            self._next_fetch = now + self.ttl
+            WEATHER_FETCHES.inc(airport=self.airport_code, result='ok')
+        except (requests.RequestException, KeyError, TypeError, ValueError) as e:
+            logger.warning("Could not fetch weather for %s: %s", self.airport_code, e)
+            self._next_fetch = now + self.retry_interval
+            WEATHER_FETCHES.inc(airport=self.airport_code, result='error')
+
+    def get(self):
+        """Return the current weather as a dict (with 'fetched_at'), or None if unavailable."""
+        if 'latitude' not in self.coordinates or 'longitude' not in self.coordinates:
+            return None
+        if time.time() >= self._next_fetch:
+            # Only wait for the refresh if there is nothing to serve meanwhile
+            if self._lock.acquire(blocking=self._current is None):
+                try:
+                    self._refresh()
+                finally:
+                    self._lock.release()
+        if self._current is None or time.time() - self._fetched_at > self.max_age:
+            return None
+        return dict(self._current, fetched_at=self._fetched_at)
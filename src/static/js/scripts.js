@@ -1,4 +1,217 @@
-// Auto reload the page every 60 seconds
-setTimeout(() => {
-    location.reload();
-}, 60000);
\ No newline at end of file
+// Live board updates: receive changed rows over /stream (or poll /api/board
+// when the stream is unavailable) and patch the tables in place instead of
+// reloading the whole page
+(function () {
+    const body = document.body;
+    let version = parseInt(body.dataset.boardVersion, 10) || 0;
+    let streamConnected = false;
+    const refreshMs = (parseInt(body.dataset.refreshInterval, 10) || 60) * 1000;
+    const airport = encodeURIComponent(body.dataset.airport || '');
+
+    const DIRECTIONS = {
+        departures: { label: 'dep', empty: 'No departures at this time', airportKey: 'destination' },
+        arrivals: { label: 'arr', empty: 'No arrivals at this time', airportKey: 'origin' }
+    };
+
+    function escapeHtml(value) {
+        return String(value == null ? '' : value)
+            .replace(/&/g, '&amp;')
+            .replace(/</g, '&lt;')
+            .replace(/>/g, '&gt;')
+            .replace(/"/g, '&quot;');
+    }
+
+    function normalizeIdent(value) {
+        return String(value || '').replace(/ /g, '').toUpperCase();
+    }
+
+    // Mirrors the show_registration macro in index.html
+    function registrationHtml(flight) {
+        const reg = normalizeIdent(flight.registration);
+        const regNoN = reg.startsWith('N') ? reg.slice(1) : reg;
+        const flightNorm = normalizeIdent(flight.flight);
+        let html = '';
+        if (reg && reg !== 'N/A' && regNoN !== flightNorm && reg !== flightNorm) {
+            html += ' | ' + escapeHtml(flight.registration);
+        }
+        if (!flight.registration || flight.registration === 'N/A') {
+            html += ' | Not Yet Assigned';
+        }
+        return html;
+    }
+
+    function statusHtml(direction, flight) {
+        if (flight.is_special_status) {
+            return `<span class="${escapeHtml(flight.status_class)}">${escapeHtml(flight.status)}</span>`;
+        }
+        if (flight.status === 'Scheduled') {
+            return 'Scheduled';
+        }
+        let html = `Estimated ${DIRECTIONS[direction].label}`;
+        if (flight.estimated_time !== 'N/A') {
+            html += ` <span class="${escapeHtml(flight.delay_status)}">${escapeHtml(flight.estimated_time)}</span>`;
+        }
+        return html;
+    }
+
+    function rowHtml(direction, flight) {
+        const airport = flight[DIRECTIONS[direction].airportKey] || {};
+        let flightCell = '';
+        if (flight.logo) {
+            flightCell += `<img src="${escapeHtml(flight.logo_url)}" alt="${escapeHtml(flight.carrier)}" style="height: 20px; margin-right: 5px; vertical-align: middle;">`;
+        }
+        flightCell += escapeHtml(flight.flight);
+        if (flight.aircraft) {
+            flightCell += `<span class="aircraft">${escapeHtml(flight.aircraft_name)}${registrationHtml(flight)}</span>`;
+        }
+        let airportCell = escapeHtml(airport.name);
+        if (airport.code) {
+            airportCell += ` <span class="airport-code">${escapeHtml(airport.code)}</span>`;
+        }
+        return `<td>${escapeHtml(flight.scheduled_time)}</td>` +
+            `<td>${flightCell}</td>` +
+            `<td>${airportCell}</td>` +
+            `<td class="status">${statusHtml(direction, flight)}</td>`;
+    }
+
+    function renderRow(direction, flight, row) {
+        row = row || document.createElement('tr');
+        row.dataset.key = flight.key;
+        row.className = direction === 'arrivals' && flight.status_class === 'landed' ? 'flight-landed' : '';
+        row.innerHTML = rowHtml(direction, flight);
+        return row;
+    }
+
+    function currentRows(tbody) {
+        const rows = new Map();
+        tbody.querySelectorAll('tr[data-key]').forEach(row => rows.set(row.dataset.key, row));
+        return rows;
+    }
+
+    // Reorder rows to match the server order, moving only rows that are out of place
+    function placeRows(tbody, direction, order, rows) {
+        const emptyRow = tbody.querySelector('tr.empty-row');
+        if (order.length === 0) {
+            if (!emptyRow) {
+                tbody.innerHTML = `<tr class="empty-row"><td colspan="4">${DIRECTIONS[direction].empty}</td></tr>`;
+            }
+            return;
+        }
+        if (emptyRow) {
+            emptyRow.remove();
+        }
+        let cursor = tbody.firstElementChild;
+        order.forEach(key => {
+            const row = rows.get(key);
+            if (!row) {
+                return;
+            }
+            if (row !== cursor) {
+                tbody.insertBefore(row, cursor);
+            } else {
+                cursor = cursor.nextElementSibling;
+            }
+        });
+    }
+
+    function applyFull(direction, flights) {
+        const tbody = document.getElementById(`${direction}-body`);
+        const rows = currentRows(tbody);
+        const seen = new Map();
+        flights.forEach(flight => seen.set(flight.key, renderRow(direction, flight, rows.get(flight.key))));
+        rows.forEach((row, key) => { if (!seen.has(key)) row.remove(); });
+        placeRows(tbody, direction, flights.map(flight => flight.key), seen);
+    }
+
+    function applyDiff(direction, changes) {
+        const tbody = document.getElementById(`${direction}-body`);
+        const rows = currentRows(tbody);
+        changes.removed.forEach(key => {
+            const row = rows.get(key);
+            if (row) {
+                row.remove();
+                rows.delete(key);
+            }
+        });
+        changes.added.concat(changes.changed).forEach(flight => {
+            rows.set(flight.key, renderRow(direction, flight, rows.get(flight.key)));
+        });
+        placeRows(tbody, direction, changes.order, rows);
+    }
+
+    function applyStatus(data) {
+        document.getElementById('last-update').textContent = data.last_update || '';
+        document.getElementById('stale-note').textContent =
+            data.stale_minutes == null ? '' : ` (data ${data.stale_minutes} min old)`;
+        let errorBox = document.getElementById('board-error');
+        if (data.error) {
+            if (!errorBox) {
+                errorBox = document.createElement('div');
+                errorBox.id = 'board-error';
+                errorBox.className = 'error-message';
+                document.getElementById('board-header').appendChild(errorBox);
+            }
+            errorBox.textContent = `Error: ${data.error}`;
+        } else if (errorBox) {
+            errorBox.remove();
+        }
+    }
+
+    function applyBoard(data) {
+        Object.keys(DIRECTIONS).forEach(direction => {
+            if (data.full) {
+                applyFull(direction, data[direction]);
+            } else {
+                applyDiff(direction, data[direction]);
+            }
+        });
+        applyStatus(data);
+        version = data.version;
+    }
+
+    async function refreshBoard() {
+        try {
+            const res = await fetch(`/api/board?airport=${airport}&since=${version}`, { cache: 'no-store' });
+            if (!res.ok) {
+                return;
+            }
+            applyBoard(await res.json());
+        } catch (e) {
+            // Keep showing the current board; the next poll will catch up
+        }
+    }
+
+    function connectStream() {
+        if (!window.EventSource) {
+            return;
+        }
+        const source = new EventSource(`/stream?airport=${airport}`);
+        source.onopen = () => {
+            streamConnected = true;
+            // Catch up on anything published while we were disconnected
+            refreshBoard();
+        };
+        source.onerror = () => {
+            // EventSource reconnects on its own; poll until it does
+            streamConnected = false;
+        };
+        source.addEventListener('board', event => {
+            const data = JSON.parse(event.data);
+            if (data.version === version) {
+                return;
+            }
+            if (data.since === version) {
+                applyBoard(data);
+            } else {
+                refreshBoard();
+            }
+        });
+    }
+
+    connectStream();
+    setInterval(() => {
+        if (!streamConnected) {
+            refreshBoard();
+        }
+    }, refreshMs);
+})();
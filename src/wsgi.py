@@ -0,0 +1,11 @@
+"""WSGI entry point for production web workers.
+
+Workers never call FlightRadar24 themselves: they mirror the boards that
+fetcher.py publishes to the snapshot file, so adding workers adds page
+throughput without adding upstream API calls.
+
+    gunicorn --chdir src --workers 4 --threads 64 wsgi:app
+"""
+from app import app, follow_snapshots
+
+follow_snapshots()